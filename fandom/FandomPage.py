@@ -1,15 +1,215 @@
 import re
-import requests
 import copy
-from bs4 import BeautifulSoup, NavigableString, Tag
+import threading
+from html import unescape
 
-from .util import stdout_encode, _wiki_request
+from . import util
+from .util import cache, stdout_encode, _wiki_request, _continued_request
 
 from fandom.error import (
   PageError, RedirectError, HTTPTimeoutError, FandomError,
   ODD_ERROR_MESSAGE)
 
 STANDARD_URL = 'https://{wiki}.fandom.com/{lang}/wiki/{page}'
+WIKI_URL = re.compile(r'https?://([^./]+)\.fandom\.com/')
+
+def _clean_content(content):
+  keys = list(content.keys())
+  if 'sections' in content: keys.remove('sections')
+
+  for key in keys:
+    if content[key] != "":
+      content[key] = re.sub(u'\xa0', ' ', content[key])
+      content[key] = re.sub(r'\[.*?\]', '', content[key])
+      content[key] = re.sub(' +', ' ', content[key])
+      content[key] = re.sub('\n+', '\n', content[key])
+      if content[key] == "\n":
+        content[key] = ""
+      else:
+        content[key] = content[key][1:] if content[key][0] == '\n' else content[key]
+        content[key] = content[key][:-1] if content[key][-1] == '\n' else content[key]
+
+  if 'sections' in content:
+    for s in content['sections']:
+      s = _clean_content(s)
+
+  return content
+
+def _infobox_text(node):
+  for br in node.find_all('br'):
+    br.replace_with('\n')
+  text = re.sub(u'\xa0', ' ', node.get_text())
+  text = re.sub(r'\[.*?\]', '', text)
+  return re.sub(' +', ' ', text).strip()
+
+def _infobox_data(node):
+  data = {}
+  for item in node.find_all('div', class_="pi-data", recursive=False):
+    label = item.find(class_="pi-data-label")
+    value = item.find(class_="pi-data-value")
+    if value is None: continue
+    key = _infobox_text(label) if label else item.get('data-source', "")
+    data[key] = _infobox_text(value)
+
+  for table in node.find_all('table', class_="pi-horizontal-group", recursive=False):
+    labels = [_infobox_text(th) for th in table.find_all('th', class_="pi-data-label")]
+    values = [_infobox_text(td) for td in table.find_all('td', class_="pi-data-value")]
+    data.update(zip(labels, values))
+
+  return data
+
+def _parse_infobox(box):
+  """
+  Turn a portable infobox into a dict with its title, image URLs, top level
+  label/value pairs and grouped label/value pairs.
+  """
+  title = box.find(class_="pi-title")
+  infobox = {
+    'title': _infobox_text(title) if title else None,
+    'images': [],
+    'data': _infobox_data(box),
+    'groups': []
+  }
+
+  for image in box.find_all('figure', class_="pi-image"):
+    link = image.find('a')
+    img = image.find('img')
+    if link is not None and link.has_attr('href'):
+      infobox['images'].append(link['href'])
+    elif img is not None and img.has_attr('src'):
+      infobox['images'].append(img['src'])
+
+  for group in box.find_all('section', class_="pi-group"):
+    header = group.find(class_="pi-header")
+    infobox['groups'].append({
+      'header': _infobox_text(header) if header else None,
+      'data': _infobox_data(group)
+    })
+
+  return infobox
+
+def _parse_content(html, title):
+  """
+  Parse the rendered HTML of a page into the section structure returned by
+  :class:`FandomPage.content` and the structured infoboxes returned by
+  :class:`FandomPage.infobox`, in a single pass.
+
+  Kept at module level so it can be shipped to worker processes by
+  :class:`fandom.pages`.
+  """
+  # bs4 is slow to import, and only needed once a page is actually parsed
+  from bs4 import BeautifulSoup, NavigableString, Tag
+
+  soup = BeautifulSoup(html, 'html.parser')
+
+  page_content = copy.copy(soup.find('div', class_="mw-parser-output"))
+
+  infoboxes = page_content.find_all('aside', class_="portable-infobox")
+  infobox_content = ""
+  infobox = []
+  for box in infoboxes:
+      infobox_content += box.text
+      infobox.append(_parse_infobox(box))
+      box.decompose()
+
+  toc = page_content.find('div', id='toc')
+  if toc: toc.decompose()
+
+  message_boxes = page_content.find_all('table', class_="messagebox")
+  for box in message_boxes:
+    box.decompose()
+
+  captions = page_content.find_all('p', class_="caption")
+  for caption in captions:
+    caption.decompose()
+
+  nav_boxes = page_content.find_all('table', class_="navbox")
+  for box in nav_boxes:
+    box.decompose()
+
+  content = {'title': title}
+  level_tree = [content]
+  current_level = 1
+
+  next_node = page_content.contents[0]
+  while isinstance(next_node, NavigableString) or next_node.name in ["div", "figure", "table"]:
+    next_node = next_node.nextSibling
+
+  section_text = ""
+  while True:
+    if next_node is None:
+      level_tree[-1]['content'] = section_text
+      break
+    elif isinstance(next_node, Tag):
+      if next_node.name[0] == 'h':
+        level_tree[-1]['content'] = section_text
+        header = next_node.text
+        header_level = int(next_node.name[1])
+        if header_level > current_level:
+          level_dif = header_level - current_level
+          for _ in range(level_dif):
+            level_tree[-1]['sections'] = [{'title':header}]
+            level_tree.append(level_tree[-1]['sections'][0])
+        elif header_level == current_level:
+          level_tree[-2]['sections'].append({'title':header})
+          level_tree[-1] = level_tree[-2]['sections'][-1]
+        else:
+          level_dif = header_level - current_level
+          level_tree = level_tree[:level_dif]
+          level_tree[-2]['sections'].append({'title':header})
+          level_tree[-1] = level_tree[-2]['sections'][-1]
+
+        section_text = ""
+        current_level = header_level
+      #elif next_node.name == 'div':
+      elif (not next_node.has_attr('class')) or (next_node['class'][0] != "printfooter"):
+        section_text += "\n"+next_node.get_text()
+    next_node = next_node.nextSibling
+
+  if infobox_content != "": content['infobox'] = infobox_content
+
+  return _clean_content(content), infobox
+
+@cache
+def _section_indexes(wiki, language, pageid, revision_id):
+  """
+  Map the lowercased title of each section of a page revision to its
+  section index, or to None for sections that can't be fetched on their own.
+  """
+  query_params = {
+    'action': 'parse',
+    'wiki': wiki,
+    'lang': language,
+    'oldid': revision_id,
+    'prop': 'sections'
+  }
+  request = _wiki_request(query_params)
+
+  indexes = {}
+  for section in request['parse']['sections']:
+    title = unescape(re.sub(r'<.*?>', '', section['line'])).lower()
+    # Sections transcluded from templates have indexes like "T-1", and can't be fetched on their own
+    index = section['index'] if section['index'].isdigit() else None
+    if indexes.get(title) is None:
+      indexes[title] = index
+  return indexes
+
+@cache
+def _section_html(wiki, language, pageid, revision_id, index):
+  """
+  The rendered HTML of a single section of a page revision.
+  """
+  query_params = {
+    'action': 'parse',
+    'wiki': wiki,
+    'lang': language,
+    'oldid': revision_id,
+    'section': index,
+    'prop': 'text',
+    'disableeditsection': True
+  }
+  request = _wiki_request(query_params)
+  return request['parse']['text']
 
 class FandomPage(object):
   """
@@ -33,6 +233,7 @@ class FandomPage(object):
     self.title = title
     self.pageid = pageid
     self.language = language
+    self._lock = threading.RLock()
 
     self.wiki = wiki
     try:
@@ -43,6 +244,15 @@ class FandomPage(object):
       for prop in ('content', 'summary', 'images', 'sections'):
         getattr(self, prop)
 
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    del state['_lock']
+    return state
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    self._lock = threading.RLock()
+
   def __repr__(self):
     return stdout_encode(u'<FandomPage \'{}\'>'.format(self.title))
 
@@ -56,6 +266,16 @@ class FandomPage(object):
     except:
       return False
 
+  def _set_content(self, content, infobox):
+    """
+    Store the parsed content and infoboxes of the page, and add the page to
+    the local index if one is set with :class:`fandom.set_local_index`.
+    """
+    self._infobox = infobox
+    self._content = content
+    if util.LOCAL_INDEX is not None:
+      util.LOCAL_INDEX.add(self)
+
   def __load(self, redirect=True, preload=False):
     """
     Load basic information from fandom.
@@ -78,10 +298,10 @@ class FandomPage(object):
     query = request['query']
     if (not redirect) and ('redirects' in query):
       raise RedirectError(query['redirects'][0]['from'])
-    elif list(query['pages'].keys()) == ['-1']:
+    elif 'missing' in query['pages'][0] or 'invalid' in query['pages'][0]:
       raise PageError(self.pageid if self.pageid else None, self.title if self.title else None)
     else:
-      query = list(query["pages"].values())[0]
+      query = query['pages'][0]
     self.pageid = query['pageid']
     self.title = query['title']
     lang = query_params['lang']
@@ -93,29 +313,19 @@ class FandomPage(object):
     Based on https://www.mediawiki.org/wiki/API:Query#Continuing_queries
     """
     query_params.update(self.__title_query_param)
+    query_params.update({'action': 'query', 'wiki': self.wiki, 'lang': self.language})
 
-    last_continue = {}
     prop = query_params.get('prop', None)
 
-    while True:
-      params = query_params.copy()
-      params.update(last_continue)
-
-      request = _wiki_request(params)
-
+    for request in _continued_request(query_params):
       if 'query' not in request:
         break
 
       pages = request['query']['pages']
       if 'generator' in query_params:
-        yield from pages.values()
+        yield from pages
       else:
-        yield pages[self.pageid][prop]
-
-      if 'continue' not in request:
-        break
-
-      last_continue = request['continue']
+        yield pages[0].get(prop, [])
 
   @property
   def __title_query_param(self):
@@ -133,11 +343,44 @@ class FandomPage(object):
     """
 
     if not getattr(self, '_html', False):
-      request = requests.get(self.url)
-      self._html = request.text
+      with self._lock:
+        if not getattr(self, '_html', False):
+          import requests
+          request = requests.get(self.url)
+          # Raise on error pages instead of keeping them as the page's HTML
+          request.raise_for_status()
+          self._html = request.text
 
     return self._html
 
+  @property
+  def wikitext(self):
+    """
+    The raw wikitext of the current revision of the page.
+
+    .. note::
+      The wikitext is much smaller than the rendered HTML. Use :class:`fandom.wikitext_pages` to get the wikitext of many pages in batches.
+
+    :returns: :class:`str`
+    """
+    # Blank pages have an empty wikitext, which still counts as loaded
+    if getattr(self, '_wikitext', None) is None:
+      query_params = {
+        'action': 'query',
+        'pageids': self.pageid,
+        'wiki': self.wiki,
+        'lang': self.language,
+        'prop': "revisions",
+        'rvprop': "ids|content",
+        'rvslots': "main"
+      }
+      request = _wiki_request(query_params)
+      revision = request['query']['pages'][0]['revisions'][0]
+      self._revision_id = revision['revid']
+      self._wikitext = revision['slots']['main']['content']
+
+    return self._wikitext
+
   @property
   def content(self):
     """
@@ -150,98 +393,30 @@ class FandomPage(object):
 
     :returns: :class:`dict`
     """
-    def clean(content):
-      keys = list(content.keys())
-      if 'sections' in content: keys.remove('sections')
-
-      for key in keys:
-        if content[key] != "":
-          content[key] = re.sub(u'\xa0', ' ', content[key])
-          content[key] = re.sub(r'\[.*?\]', '', content[key])
-          content[key] = re.sub(' +', ' ', content[key])
-          content[key] = re.sub('\n+', '\n', content[key])
-          if content[key] == "\n":
-            content[key] = ""
-          else:
-            content[key] = content[key][1:] if content[key][0] == '\n' else content[key]
-            content[key] = content[key][:-1] if content[key][-1] == '\n' else content[key]
-
-      if 'sections' in content:
-        for s in content['sections']:
-          s = clean(s)
-
-      return content
-
     if not getattr(self, '_content', False):
-      html = self.html
-      soup = BeautifulSoup(html, 'html.parser')
-
-      page_content = copy.copy(soup.find('div', class_="mw-parser-output"))
-
-      infoboxes = page_content.find_all('aside', class_="portable-infobox")
-      infobox_content = ""
-      for box in infoboxes:
-          infobox_content += box.text
-          box.decompose()
-
-      toc = page_content.find('div', id='toc')
-      if toc: toc.decompose()
-
-      message_boxes = page_content.find_all('table', class_="messagebox")
-      for box in message_boxes:
-        box.decompose()
-
-      captions = page_content.find_all('p', class_="caption")
-      for caption in captions:
-        caption.decompose()
-
-      nav_boxes = page_content.find_all('table', class_="navbox")
-      for box in nav_boxes:
-        box.decompose()
+      with self._lock:
+        if not getattr(self, '_content', False):
+          self._set_content(*_parse_content(self.html, self.title))
+    return self._content
 
-      content = {'title': self.title}
-      level_tree = [content]
-      current_level = 1
+  @property
+  def infobox(self):
+    """
+    Structured data from the infoboxes on the page. Each infobox is a dict
+    with the keys 'title', 'images' (a list of image URLs), 'data' (a dict of
+    label to value) and 'groups' (a list of dicts with a 'header' and their
+    own 'data').
 
-      next_node = page_content.contents[0]
-      while isinstance(next_node, NavigableString) or next_node.name in ["div", "figure", "table"]:
-        next_node = next_node.nextSibling
+    .. note::
+      The infoboxes are extracted while parsing FandomPage.content, so accessing both only parses the page once.
 
-      section_text = ""
-      while True:
-        if next_node is None:
-          level_tree[-1]['content'] = section_text
-          break
-        elif isinstance(next_node, Tag):
-          if next_node.name[0] == 'h':
-            level_tree[-1]['content'] = section_text
-            header = next_node.text
-            header_level = int(next_node.name[1])
-            if header_level > current_level:
-              level_dif = header_level - current_level
-              for _ in range(level_dif):
-                level_tree[-1]['sections'] = [{'title':header}]
-                level_tree.append(level_tree[-1]['sections'][0])
-            elif header_level == current_level:
-              level_tree[-2]['sections'].append({'title':header})
-              level_tree[-1] = level_tree[-2]['sections'][-1]
-            else:
-              level_dif = header_level - current_level
-              level_tree = level_tree[:level_dif]
-              level_tree[-2]['sections'].append({'title':header})
-              level_tree[-1] = level_tree[-2]['sections'][-1]
-
-            section_text = ""
-            current_level = header_level
-          #elif next_node.name == 'div':
-          elif (not next_node.has_attr('class')) or (next_node['class'][0] != "printfooter"):
-            section_text += "\n"+next_node.get_text()
-        next_node = next_node.nextSibling
-
-      if infobox_content != "": content['infobox'] = infobox_content
-
-      self._content = clean(content)
-    return self._content
+    :returns: :class:`list` of :class:`dict`
+    """
+    if not hasattr(self, '_infobox'):
+      with self._lock:
+        if not hasattr(self, '_infobox'):
+          self._set_content(*_parse_content(self.html, self.title))
+    return self._infobox
 
   @property
   def revision_id(self):
@@ -254,7 +429,7 @@ class FandomPage(object):
     :returns: :class:`int`
     """
 
-    if not getattr(self, '_revid', False):
+    if not getattr(self, '_revision_id', False):
       query_params = {
         'action': 'query',
         'pageids': self.pageid,
@@ -263,7 +438,7 @@ class FandomPage(object):
         'prop': "revisions"
       }
       request = _wiki_request(query_params)
-      self._revision_id = request['query']['pages'][str(self.pageid)]['revisions'][0]['revid']
+      self._revision_id = request['query']['pages'][0]['revisions'][0]['revid']
 
     return self._revision_id
 
@@ -309,24 +484,110 @@ class FandomPage(object):
         'imlimit': 500
       }
       request = _wiki_request(query_params)
-      if 'images' in request['query']['pages'][str(self.pageid)]:
-        images = [image['title'] for image in request['query']['pages'][str(self.pageid)]['images']]
-      else:
-        images = []
+      images = [image['title'] for image in request['query']['pages'][0].get('images', [])]
 
       if images != []:
         query_params.pop('pageids')
-        query_params['titles'] = images
+        query_params.pop('imlimit')
         query_params['prop'] = 'imageinfo'
-        query_params['iilimit'] = 5000
         query_params['iiprop'] = 'url'
 
-        request = _wiki_request(query_params)
-        images = [page['imageinfo'][0]['url'] for page in request['query']['pages'].values() if 'imageinfo' in page]
+        # The titles have to be sent as a single "|" separated parameter,
+        # at most 50 at a time
+        urls = []
+        for i in range(0, len(images), 50):
+          query_params['titles'] = "|".join(images[i:i+50])
+          request = _wiki_request(query_params)
+          urls += [page['imageinfo'][0]['url'] for page in request['query']['pages'] if 'imageinfo' in page]
+        images = urls
 
       self._images = images
     return self._images
 
+  @property
+  def links(self):
+    """
+    List of titles of the articles linked from the page.
+
+    :returns: :class:`list`
+    """
+    if not getattr(self, '_links', False):
+      query_params = {
+        'prop': "links",
+        'plnamespace': 0,
+        'pllimit': "max"
+      }
+      self._links = [link['title'] for links in self.__continued_query(query_params) for link in links]
+
+    return self._links
+
+  @property
+  def backlinks(self):
+    """
+    List of titles of the articles that link to the page.
+
+    :returns: :class:`list`
+    """
+    if not getattr(self, '_backlinks', False):
+      query_params = {
+        'action': "query",
+        'wiki': self.wiki,
+        'lang': self.language,
+        'list': "backlinks",
+        'blpageid': self.pageid,
+        'blnamespace': 0,
+        'bllimit': "max"
+      }
+      self._backlinks = [
+        link['title']
+        for request in _continued_request(query_params)
+        for link in request['query']['backlinks']
+      ]
+
+    return self._backlinks
+
+  @property
+  def categories(self):
+    """
+    List of titles of the categories the page is in.
+
+    :returns: :class:`list`
+    """
+    if not getattr(self, '_categories', False):
+      query_params = {
+        'prop': "categories",
+        'cllimit': "max"
+      }
+      self._categories = [category['title'] for categories in self.__continued_query(query_params) for category in categories]
+
+    return self._categories
+
+  @property
+  def langlinks(self):
+    """
+    The versions of the page in other languages, as a dict of language code to
+    a dict with the 'title' of the page, the 'wiki' it's on and its 'url'.
+
+    :returns: :class:`dict`
+    """
+    if not getattr(self, '_langlinks', False):
+      query_params = {
+        'prop': "langlinks",
+        'llprop': "url",
+        'lllimit': "max"
+      }
+      self._langlinks = {}
+      for langlinks in self.__continued_query(query_params):
+        for link in langlinks:
+          link_wiki = WIKI_URL.match(link.get('url', ""))
+          self._langlinks[link['lang']] = {
+            'title': link['title'],
+            'wiki': link_wiki.group(1) if link_wiki else self.wiki,
+            'url': link.get('url')
+          }
+
+    return self._langlinks
+
   @property
   def sections(self):
     """
@@ -356,6 +617,9 @@ class FandomPage(object):
     Get the plain text content of a section from `self.sections`.
     Returns None if `section_title` isn't found, otherwise returns a str.
 
+    If the content of the page hasn't been loaded yet, only the requested
+    section is downloaded and parsed, instead of the whole page.
+
     .. warning::
       When calling this function, subheadings in the section you asked for are part of the plain text. If you want more control of what data you get, you should use FandomPage.content
 
@@ -382,11 +646,41 @@ class FandomPage(object):
 
     if section_title.lower() == self.title.lower():
       return get_section_recursive([self.content], self.content['title'].lower())
-    elif section_title.lower() not in [i.lower() for i in self.sections] or 'sections' not in self.content:
+
+    if not getattr(self, '_content', False):
+      indexes = _section_indexes(self.wiki, self.language, self.pageid, self.revision_id)
+      # Every section is listed, including transcluded ones, so there's no
+      # need to download the full page for a section that doesn't exist
+      if section_title.lower() not in indexes:
+        return None
+      if indexes[section_title.lower()] is not None:
+        section = self._fetch_section(section_title, indexes[section_title.lower()])
+        return get_section_recursive([section], section['title'].lower())
+
+    # Either the content is already loaded, or the section can't be fetched
+    # on its own, so look for it in the full content
+    if section_title.lower() not in [i.lower() for i in self.sections] or 'sections' not in self.content:
       return None
     else:
       return get_section_recursive(self.content['sections'], section_title.lower())
 
+  def _fetch_section(self, section_title, index):
+    """
+    Download and parse only the section with the given title and section
+    index. Returns the section as a dict in the format of the sections in
+    FandomPage.content.
+    """
+    html = _section_html(self.wiki, self.language, self.pageid, self.revision_id, index)
+    content = _parse_content(html, self.title)[0]
+
+    # The section's heading is the first thing in the HTML. Headings below
+    # level 2 are nested in placeholder sections without content
+    while 'sections' in content and 'content' not in content['sections'][0]:
+      content = content['sections'][0]
+    if 'sections' not in content:
+      return {'title': section_title, 'content': content['content']}
+    return content['sections'][0]
+
   @property
   def plain_text(self):
     """
@@ -1,6 +1,12 @@
 from .FandomPage import FandomPage
-from .fandom import default_url, page, random, search, set_lang, set_rate_limiting, set_wiki, set_user_agent, summary
+from .wikitext import WikitextPage
+from .dump import read_dump
+from .export import write_jsonl, write_parquet
+from .index import LocalIndex
+from .fandom import category_members, clear_cache, default_url, link_graph, page, page_langlinks, pages, random, resolve, search, search_batch, search_iter, search_many, set_lang, set_local_index, set_page_cache_size, set_rate_limiting, set_wiki, set_user_agent, suggest, summary, wikitext_pages
+from .prefetch import Prefetcher
+from .crawl import CrawlJob
 
 __version__ = (0, 2, 1)
 
-__all__ = ["default_url", "page", "random", "search", "set_lang", "set_rate_limiting", "set_wiki", "set_user_agent", "summary"]
+__all__ = ["category_members", "clear_cache", "default_url", "link_graph", "page", "page_langlinks", "pages", "random", "read_dump", "resolve", "search", "search_batch", "search_iter", "search_many", "set_lang", "set_local_index", "set_page_cache_size", "set_rate_limiting", "set_wiki", "set_user_agent", "suggest", "summary", "wikitext_pages", "write_jsonl", "write_parquet"]
@@ -0,0 +1,210 @@
+"""
+Resumable crawls over pages, with their progress kept in SQLite.
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from fandom.fandom import page, _discard_page
+
+def _titles(titles):
+  """
+  Turn a title, or an iterable of titles and (title, pageid) tuples, into a
+  list of titles.
+  """
+  if titles is None:
+    return []
+  if isinstance(titles, str):
+    return [titles]
+  return [title[0] if isinstance(title, tuple) else title for title in titles]
+
+class CrawlJob(object):
+  """
+  A crawl over pages that keeps its frontier and completed pages in an
+  SQLite database, so it can be resumed after a crash or restart without
+  loading any completed page again.
+
+  Each page is loaded with :class:`fandom.page`, the requested properties
+  are loaded, and the page is passed to `handler`. The handler can return
+  more titles to add to the crawl. A page is only marked as done once its
+  handler returns. Pages that fail are retried with exponential backoff,
+  and marked as failed after `max_retries` attempts.
+
+  :param path: The path of the SQLite database to keep the crawl in
+  :param handler: Function called with each loaded FandomPage. Can return a title or an iterable of titles to add to the crawl
+  :param wiki: The wiki to crawl (defaults to the global wiki variable)
+  :param language: The language to crawl (defaults to the global language variable)
+  :param fields: The FandomPage properties to load before calling the handler
+  :param max_retries: The number of attempts before a page is marked as failed
+  :param backoff: The wait before the first retry of a page in seconds, doubling with every further attempt
+  :type path: str
+  :type wiki: str
+  :type language: str
+  :type fields: tuple
+  :type max_retries: int
+  :type backoff: float
+  """
+
+  def __init__(self, path : str, handler = None, wiki : str = "", language : str = "", fields : tuple = ('content',), max_retries : int = 3, backoff : float = 1.0):
+    self.handler = handler
+    self.wiki = wiki
+    self.language = language
+    self.fields = tuple(fields)
+    self.max_retries = max_retries
+    self.backoff = backoff
+
+    self._started = None
+    self._completed_in_run = 0
+    self._lock = threading.Lock()
+    self._connection = sqlite3.connect(path, check_same_thread=False)
+    with self._lock, self._connection:
+      self._connection.execute(
+        "CREATE TABLE IF NOT EXISTS items ("
+        "title TEXT PRIMARY KEY, status TEXT NOT NULL DEFAULT 'pending', "
+        "attempts INTEGER NOT NULL DEFAULT 0, next_try REAL NOT NULL DEFAULT 0, error TEXT)"
+      )
+      self._connection.execute("CREATE INDEX IF NOT EXISTS items_status ON items (status, next_try)")
+
+  def add(self, titles):
+    """
+    Add pages to the crawl. Pages that are already part of it, including
+    completed ones, are ignored.
+
+    :param titles: A title, or the titles of the pages, or (title, pageid) tuples like the ones returned by :class:`fandom.search`
+    """
+    rows = [(title,) for title in _titles(titles)]
+    with self._lock, self._connection:
+      self._connection.executemany("INSERT OR IGNORE INTO items (title) VALUES (?)", rows)
+
+  def retry_failed(self):
+    """Queue the pages that failed to be crawled again, with their attempts reset."""
+    with self._lock, self._connection:
+      self._connection.execute(
+        "UPDATE items SET status = 'pending', attempts = 0, next_try = 0 WHERE status = 'failed'"
+      )
+
+  def failures(self):
+    """
+    The pages that failed to be crawled.
+
+    :returns: :class:`dict` of title to the last error message
+    """
+    with self._lock:
+      return dict(self._connection.execute("SELECT title, error FROM items WHERE status = 'failed'"))
+
+  def progress(self):
+    """
+    The progress of the crawl. Can be called from another thread while the
+    crawl is running.
+
+    :returns: :class:`dict` with the number of 'pending', 'running', 'done' and 'failed' pages, the 'elapsed' seconds of the current run and its 'rate' in pages per second
+    """
+    with self._lock:
+      counts = dict(self._connection.execute("SELECT status, COUNT(*) FROM items GROUP BY status"))
+
+    elapsed = time.monotonic() - self._started if self._started is not None else 0
+    progress = {status: counts.get(status, 0) for status in ('pending', 'running', 'done', 'failed')}
+    progress['elapsed'] = elapsed
+    progress['rate'] = self._completed_in_run / elapsed if elapsed else 0
+    return progress
+
+  def _claim(self, count):
+    with self._lock, self._connection:
+      titles = [row[0] for row in self._connection.execute(
+        "SELECT title FROM items WHERE status = 'pending' AND next_try <= ? ORDER BY rowid LIMIT ?",
+        (time.time(), count)
+      )]
+      self._connection.executemany("UPDATE items SET status = 'running' WHERE title = ?", [(t,) for t in titles])
+    return titles
+
+  def _next_retry_wait(self):
+    with self._lock:
+      next_try = self._connection.execute(
+        "SELECT MIN(next_try) FROM items WHERE status = 'pending'"
+      ).fetchone()[0]
+    return None if next_try is None else max(next_try - time.time(), 0)
+
+  def _process(self, title):
+    try:
+      fandom_page = page(title, wiki=self.wiki, language=self.language)
+      for field in self.fields:
+        getattr(fandom_page, field)
+      if self.handler is not None:
+        # Normalized here, so a bad return value fails this page instead of the crawl
+        return _titles(self.handler(fandom_page))
+      return []
+    except Exception:
+      # The page object is shared through the page cache, so drop it to
+      # make the retry download the page again instead of reusing it
+      _discard_page(title, self.wiki, self.language)
+      raise
+
+  def _finish(self, title, new_titles):
+    with self._lock, self._connection:
+      self._connection.execute("UPDATE items SET status = 'done', error = NULL WHERE title = ?", (title,))
+      self._connection.executemany("INSERT OR IGNORE INTO items (title) VALUES (?)", [(t,) for t in new_titles])
+    self._completed_in_run += 1
+
+  def _fail(self, title, error):
+    with self._lock, self._connection:
+      attempts = self._connection.execute("SELECT attempts FROM items WHERE title = ?", (title,)).fetchone()[0] + 1
+      if attempts >= self.max_retries:
+        self._connection.execute(
+          "UPDATE items SET status = 'failed', attempts = ?, error = ? WHERE title = ?",
+          (attempts, repr(error), title)
+        )
+      else:
+        self._connection.execute(
+          "UPDATE items SET status = 'pending', attempts = ?, next_try = ?, error = ? WHERE title = ?",
+          (attempts, time.time() + self.backoff * 2 ** (attempts - 1), repr(error), title)
+        )
+
+  def run(self, threads : int = 4):
+    """
+    Crawl until every page is either done or failed. Pages that were being
+    crawled when a previous run was interrupted are crawled again.
+
+    :param threads: The number of pages to crawl at the same time
+    :type threads: int
+
+    :returns: :class:`dict` the final :class:`fandom.crawl.CrawlJob.progress`
+    """
+    with self._lock, self._connection:
+      self._connection.execute("UPDATE items SET status = 'pending' WHERE status = 'running'")
+
+    self._started = time.monotonic()
+    self._completed_in_run = 0
+    in_flight = {}
+
+    with ThreadPoolExecutor(threads) as pool:
+      while True:
+        for title in self._claim(2 * threads - len(in_flight)):
+          in_flight[pool.submit(self._process, title)] = title
+
+        if not in_flight:
+          retry_wait = self._next_retry_wait()
+          if retry_wait is None:
+            break
+          time.sleep(retry_wait)
+          continue
+
+        # Wake up regularly, so retries that become due are picked up even
+        # while other pages are still being crawled
+        done, _ = wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+        for future in done:
+          title = in_flight.pop(future)
+          try:
+            new_titles = future.result()
+          except Exception as e:
+            self._fail(title, e)
+          else:
+            self._finish(title, new_titles)
+
+    return self.progress()
+
+  def close(self):
+    """Close the underlying database."""
+    with self._lock:
+      self._connection.close()
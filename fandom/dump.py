@@ -0,0 +1,97 @@
+"""
+Reading of MediaWiki XML database dumps (Special:Export), as an offline
+alternative to loading pages one by one from the API.
+"""
+
+import bz2
+import gzip
+import re
+import xml.etree.ElementTree as ElementTree
+
+from fandom.wikitext import WikitextPage
+
+BASE_URL = re.compile(r'https?://([^./]+)\.fandom\.com/(?:([a-z-]+)/)?wiki/')
+
+def _open(source):
+  if not isinstance(source, str):
+    return source
+  if source.endswith('.gz'):
+    return gzip.open(source, 'rb')
+  if source.endswith('.bz2'):
+    return bz2.open(source, 'rb')
+  return open(source, 'rb')
+
+def _local_name(tag):
+  return tag.rsplit('}', 1)[-1]
+
+def _child(element, name):
+  for child in element:
+    if _local_name(child.tag) == name:
+      return child
+  return None
+
+def _child_text(element, name, default=None):
+  child = _child(element, name)
+  return child.text if child is not None and child.text is not None else default
+
+def read_dump(source, wiki : str = "", language : str = "", namespaces : tuple = (0,), redirects : bool = False):
+  """
+  Read the pages of a MediaWiki XML dump, like the database dumps published
+  by fandom or the output of Special:Export.
+
+  The dump is streamed, so memory use doesn't grow with the size of the
+  dump. Only the latest revision of each page is used.
+
+  :param source: The path to the dump (optionally compressed with gzip or bzip2, going by the extension), or a file object
+  :param wiki: The wiki the dump is from (defaults to the wiki in the dump's site info)
+  :param language: The language of the dump (defaults to the language in the dump's site info, or english)
+  :param namespaces: The namespaces to read pages from. If empty, all pages are read
+  :param redirects: Whether to also read redirect pages
+  :type wiki: str
+  :type language: str
+  :type namespaces: tuple
+  :type redirects: bool
+
+  :returns: generator of :class:`fandom.WikitextPage`
+  """
+  dump = _open(source)
+  try:
+    context = ElementTree.iterparse(dump, events=('start', 'end'))
+    _, root = next(context)
+
+    for event, element in context:
+      if event != 'end':
+        continue
+
+      name = _local_name(element.tag)
+      if name == 'base' and element.text:
+        base = BASE_URL.match(element.text)
+        if base:
+          wiki = wiki or base.group(1)
+          language = language or base.group(2) or ""
+
+      elif name == 'page':
+        namespace = int(_child_text(element, 'ns', 0))
+        is_redirect = _child(element, 'redirect') is not None
+
+        if (not namespaces or namespace in namespaces) and (redirects or not is_redirect):
+          revision = None
+          for child in element:
+            if _local_name(child.tag) == 'revision':
+              revision = child
+
+          if revision is not None:
+            yield WikitextPage(
+              wiki,
+              language or "en",
+              _child_text(element, 'title'),
+              int(_child_text(element, 'id')),
+              int(_child_text(revision, 'id')),
+              _child_text(revision, 'text', "")
+            )
+
+        # Drop the pages we're done with, keeping memory use constant
+        root.clear()
+  finally:
+    if dump is not source:
+      dump.close()
@@ -0,0 +1,156 @@
+"""
+Streaming export of pages to JSON Lines and Parquet files.
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+
+# 'images' is left out, since it takes an extra request for every page, and
+# the pages from read_dump and wikitext_pages can't get it offline
+DEFAULT_FIELDS = ('title', 'pageid', 'revision_id', 'url', 'sections', 'plain_text')
+COMPRESSION = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+def _flatten_sections(sections, level=2):
+  flat = []
+  for section in sections:
+    flat.append({'title': section['title'], 'level': level, 'content': section.get('content', "")})
+    flat += _flatten_sections(section.get('sections', []), level + 1)
+  return flat
+
+def page_record(page, fields : tuple = DEFAULT_FIELDS):
+  """
+  Get a flat record of a page, with one entry for each field.
+
+  Any FandomPage property can be used as a field. The 'sections' field is
+  the content of the page as a flat list of dicts with the 'title', 'level'
+  and 'content' of each section, rather than the nested structure of
+  :class:`FandomPage.content`.
+
+  .. note::
+    'images' is not one of the default fields. It makes an extra request for every page, including pages from :class:`fandom.read_dump` and :class:`fandom.wikitext_pages`, so it isn't available offline.
+
+  :param page: The page to get the record of
+  :param fields: The fields to include
+  :type page: FandomPage
+  :type fields: tuple
+
+  :returns: :class:`dict`
+  """
+  record = {}
+  for field in fields:
+    if field == 'sections':
+      record[field] = _flatten_sections(page.content.get('sections', []))
+    else:
+      record[field] = getattr(page, field)
+  return record
+
+def write_jsonl(pages, file, fields : tuple = DEFAULT_FIELDS, compression : str = None):
+  """
+  Write pages to a JSON Lines file, one record (see :class:`fandom.export.page_record`)
+  per line. Pages are written as they are iterated over, so `pages` can be a
+  generator like :class:`fandom.read_dump`.
+
+  :param pages: The pages to write
+  :param file: The path of the file to write to, or a binary file object
+  :param fields: The fields to include for each page
+  :param compression: "gzip", "bz2" or "xz". If the file is a path, defaults to going by its extension
+  :type fields: tuple
+  :type compression: str
+
+  :returns: :class:`int` the number of pages written
+  """
+  if isinstance(file, str):
+    if compression is None:
+      compression = next((method for extension, method in EXTENSIONS.items() if file.endswith(extension)), None)
+    output = COMPRESSION[compression](file, 'wb') if compression else open(file, 'wb')
+  else:
+    output = COMPRESSION[compression](file, 'wb') if compression else file
+
+  written = 0
+  try:
+    for page in pages:
+      line = json.dumps(page_record(page, fields), ensure_ascii=False)
+      output.write(line.encode('utf-8') + b'\n')
+      written += 1
+  finally:
+    if output is not file:
+      output.close()
+
+  return written
+
+def write_parquet(pages, path : str, fields : tuple = DEFAULT_FIELDS, batch_size : int = 1000, compression : str = 'snappy'):
+  """
+  Write pages to a columnar Parquet file, one row (see :class:`fandom.export.page_record`)
+  per page. Pages are buffered and written in row groups of `batch_size`
+  pages, so at most `batch_size` pages are kept in memory.
+
+  .. note::
+    This requires pyarrow, which can be installed with `pip install fandom-py[parquet]`.
+
+  :param pages: The pages to write
+  :param path: The path of the file to write to
+  :param fields: The fields to include for each page
+  :param batch_size: The number of pages in each row group
+  :param compression: The Parquet compression codec, like "snappy", "zstd" or "gzip", or None
+  :type path: str
+  :type fields: tuple
+  :type batch_size: int
+  :type compression: str
+
+  :returns: :class:`int` the number of pages written
+  """
+  try:
+    import pyarrow
+    import pyarrow.parquet
+  except ImportError:
+    raise ImportError("write_parquet requires pyarrow. Install it with `pip install fandom-py[parquet]`")
+
+  known_types = {
+    'title': pyarrow.string(),
+    'pageid': pyarrow.int64(),
+    'revision_id': pyarrow.int64(),
+    'url': pyarrow.string(),
+    'summary': pyarrow.string(),
+    'plain_text': pyarrow.string(),
+    'images': pyarrow.list_(pyarrow.string()),
+    'sections': pyarrow.list_(pyarrow.struct([
+      ('title', pyarrow.string()),
+      ('level', pyarrow.int32()),
+      ('content', pyarrow.string())
+    ]))
+  }
+
+  schema = None
+  writer = None
+  batch = []
+  written = 0
+
+  def flush():
+    nonlocal schema, writer
+    columns = {field: [record[field] for record in batch] for field in fields}
+    if schema is None:
+      schema = pyarrow.schema([
+        (field, known_types[field]) if field in known_types else (field, pyarrow.array(columns[field]).type)
+        for field in fields
+      ])
+      writer = pyarrow.parquet.ParquetWriter(path, schema, compression=compression)
+    writer.write_table(pyarrow.Table.from_pydict(columns, schema=schema))
+    batch.clear()
+
+  try:
+    for page in pages:
+      batch.append(page_record(page, fields))
+      written += 1
+      if len(batch) >= batch_size:
+        flush()
+
+    if batch or writer is None:
+      flush()
+  finally:
+    if writer is not None:
+      writer.close()
+
+  return written
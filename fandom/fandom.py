@@ -1,20 +1,25 @@
 from __future__ import unicode_literals
 
-import requests
 import re
-import time
-import mimetypes
+from array import array
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from fandom.error import RedirectError, HTTPTimeoutError, FandomError
 from fandom import FandomPage
+from fandom.FandomPage import _parse_content, _section_indexes, _section_html
+from fandom.wikitext import WikitextPage
 import fandom.util as u
 
-# Generate all extensions from the OS
-mimetypes.init()
-
 LANG = ""
 WIKI = ""
+PAGE_CACHE_SIZE = 128
+
+# Like the other caches in this module, these are keyed on the wiki and
+# language, so they stay valid when the global wiki or language changes.
+# clear_cache empties all of them
+SUGGEST_CACHE = u.PrefixCache()
+REDIRECT_MAP = {}
 
 def default_url():
   wiki = WIKI+"." if WIKI != "" else ""
@@ -25,28 +30,28 @@ def set_wiki(wiki : str):
   """
   Sets the global wiki variable
 
+  Cached pages and results are kept, since they are stored per wiki and
+  language. Use :class:`fandom.clear_cache` to empty the caches.
+
   :param wiki: The wiki to set as the global wiki variable
   :type wiki: str
   """
   global WIKI
   WIKI = wiki.lower() if wiki else WIKI
 
-  for cached_func in (search, summary):
-    cached_func.clear_cache()
-
 def set_lang(language : str):
   """
   Sets the global language variable
 
+  Cached pages and results are kept, since they are stored per wiki and
+  language. Use :class:`fandom.clear_cache` to empty the caches.
+
   :param language: The language to set as the global language variable
   :type language: str
   """
   global LANG
   LANG = language.lower() if language else LANG
 
-  for cached_func in (search, summary):
-    cached_func.clear_cache()
-
 def set_rate_limiting(rate_limit : bool, min_wait : int = 50):
   """
   Enable or disable rate limiting on requests to the fandom servers.
@@ -72,6 +77,42 @@ def set_rate_limiting(rate_limit : bool, min_wait : int = 50):
 
   u.RATE_LIMIT_LAST_CALL = None
 
+def set_local_index(index):
+  """
+  Set the local index that pages are added to as their content is parsed,
+  and that `fandom.search(..., backend="local")` searches.
+
+  :param index: The index to use, or None to stop indexing pages
+  :type index: fandom.LocalIndex
+  """
+  u.LOCAL_INDEX = index
+
+def set_page_cache_size(size : int):
+  """
+  Set how many pages are kept in the page cache used by :class:`fandom.page`.
+  The least recently used pages are dropped first. Each cached page keeps
+  its full HTML and parsed content, so this bounds the memory used by
+  long-running crawls.
+
+  :param size: The maximum number of pages to keep, or None for no limit
+  :type size: int
+  """
+  global PAGE_CACHE_SIZE
+  PAGE_CACHE_SIZE = size
+  _page.resize(size)
+
+def clear_cache():
+  """
+  Empty every cache: the cached pages, searches, suggestions, resolved
+  redirects and sections. Pages loaded after this are downloaded again.
+  """
+  _page.clear_cache()
+  _search.clear_cache()
+  _section_indexes.clear_cache()
+  _section_html.clear_cache()
+  SUGGEST_CACHE.clear()
+  REDIRECT_MAP.clear()
+
 def set_user_agent(user_agent_string : str):
   """
   Set the User-Agent string to be used for all requests.
@@ -81,8 +122,7 @@ def set_user_agent(user_agent_string : str):
   """
   u.USER_AGENT = user_agent_string
 
-@u.cache
-def search(query : str, wiki : str = WIKI, language: str = LANG, results : int = 10):
+def search(query : str, wiki : str = WIKI, language : str = LANG, results : int = 10, backend : str = "api"):
   """
   Do a fandom search.
 
@@ -92,23 +132,38 @@ def search(query : str, wiki : str = WIKI, language: str = LANG, results : int =
   :param wiki: The wiki to search in (defaults to the global wiki variable)
   :param language: The language to search in (defaults to the global language variable)
   :param results: The maximum number of results to be returned
+  :param backend: "api" to search on fandom, or "local" to search the pages in the index set with :class:`fandom.set_local_index`
   :type query: str
   :type wiki: str
   :type language: str
   :type results: int
+  :type backend: str
 
   :returns: :class:`list` of :class:`tuple`
   """
   wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
   language = language if language != "" else (LANG if LANG != "" else "en")
 
+  if backend == "api":
+    return _search(query, wiki, language, results)
+  elif backend == "local":
+    if u.LOCAL_INDEX is None:
+      raise ValueError("No local index is set. Use fandom.set_local_index first")
+    return u.LOCAL_INDEX.search(query, wiki, language, results)
+  else:
+    raise ValueError("The backend must be either \"api\" or \"local\"")
+
+@u.cache
+def _search(query, wiki, language, results):
   search_params = {
     'action': 'query',
     'wiki': wiki,
     'lang': language,
     'srlimit': results,
     "list" : "search",
-    'srsearch': query
+    'srsearch': query,
+    'srprop': "",
+    'srinfo': ""
   }
 
   raw_results = u._wiki_request(search_params)
@@ -120,6 +175,208 @@ def search(query : str, wiki : str = WIKI, language: str = LANG, results : int =
   return list(search_results)
 
 
+def search_iter(query : str, wiki : str = WIKI, language : str = LANG, results : int = None, properties : tuple = ()):
+  """
+  Do a fandom search, streaming the results.
+
+  Unlike :class:`fandom.search`, this follows the continuation of the search
+  for as many results as are asked for, fetching them in batches while the
+  results are being iterated over. Nothing is cached.
+
+  :param query: What to search for
+  :param wiki: The wiki to search in (defaults to the global wiki variable)
+  :param language: The language to search in (defaults to the global language variable)
+  :param results: The maximum number of results to be returned (defaults to all of them)
+  :param properties: Extra search properties (srprop values like "snippet" or "timestamp") to return with each result. Leave empty for the smallest responses
+  :type query: str
+  :type wiki: str
+  :type language: str
+  :type results: int
+  :type properties: tuple
+
+  :returns: generator of :class:`tuple` with the page title and page id, or of :class:`dict` with the title, page id and requested properties if `properties` is given
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+
+  search_params = {
+    'action': 'query',
+    'wiki': wiki,
+    'lang': language,
+    'srlimit': min(results, 500) if results else 500,
+    "list" : "search",
+    'srsearch': query,
+    'srprop': "|".join(properties),
+    'srinfo': ""
+  }
+
+  if results is not None and results <= 0:
+    return
+
+  returned = 0
+  for raw_results in u._continued_request(search_params):
+    try:
+      batch = raw_results['query']['search']
+    except KeyError:
+      raise FandomError(query, wiki, language)
+
+    for d in batch:
+      if properties:
+        yield {key: value for key, value in d.items() if key != 'ns'}
+      else:
+        yield (d['title'], d['pageid'])
+
+      # Stop as soon as the last result is out, so the next batch isn't requested
+      returned += 1
+      if results is not None and returned >= results:
+        return
+
+def search_batch(queries : list, wiki : str = WIKI, language : str = LANG, results : int = 10, threads : int = 8):
+  """
+  Do several fandom searches concurrently.
+
+  Each search goes through :class:`fandom.search`, so results are cached the
+  same way.
+
+  :param queries: What to search for
+  :param wiki: The wiki to search in (defaults to the global wiki variable)
+  :param language: The language to search in (defaults to the global language variable)
+  :param results: The maximum number of results to be returned for each query
+  :param threads: The number of searches to run at the same time
+  :type queries: list
+  :type wiki: str
+  :type language: str
+  :type results: int
+  :type threads: int
+
+  :returns: :class:`list` of :class:`list` of :class:`tuple`, in the same order as `queries`
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+
+  with ThreadPoolExecutor(threads) as pool:
+    return list(pool.map(lambda query: search(query, wiki, language, results), queries))
+
+
+def suggest(prefix : str, wiki : str = WIKI, language : str = LANG, results : int = 10):
+  """
+  Get the pages whose titles start with the given prefix, for autocompletion.
+
+  This uses the much lighter prefix search instead of the full text search
+  used by :class:`fandom.search`. Results are kept in a prefix cache, so a
+  complete result for a prefix also answers any longer prefix without a
+  request.
+
+  :param prefix: The start of the page title
+  :param wiki: The wiki to search in (defaults to the global wiki variable)
+  :param language: The language to search in (defaults to the global language variable)
+  :param results: The maximum number of results to be returned
+  :type prefix: str
+  :type wiki: str
+  :type language: str
+  :type results: int
+
+  :returns: :class:`list` of :class:`tuple`
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+
+  cached = SUGGEST_CACHE.get((wiki, language), prefix, results)
+  if cached is not None:
+    return cached
+
+  query_params = {
+    'action': 'query',
+    'wiki': wiki,
+    'lang': language,
+    'list': 'prefixsearch',
+    'pssearch': prefix,
+    'pslimit': results
+  }
+
+  request = u._wiki_request(query_params)
+  try:
+    suggestions = [(d['title'], d['pageid']) for d in request['query']['prefixsearch']]
+  except KeyError:
+    raise FandomError(prefix, wiki, language)
+
+  SUGGEST_CACHE.put((wiki, language), prefix, suggestions, 'continue' not in request)
+  return suggestions
+
+
+def category_members(category : str, wiki : str = WIKI, language : str = LANG, recursive : bool = True, depth : int = None, threads : int = 4):
+  """
+  Get the pages in a category, and optionally in its subcategories.
+
+  Subcategories are crawled breadth first, with all categories on the same
+  level requested at the same time. Members are yielded as soon as the
+  request for their category finishes, each page only once, and each
+  category is only visited once.
+
+  :param category: The title of the category, with or without the "Category:" prefix
+  :param wiki: The wiki to search (defaults to the global wiki variable. If the global wiki variable is not set, defaults to "runescape")
+  :param language: The language to search in (defaults to the global language variable. If  the global language variable is not set, defaults to english)
+  :param recursive: Whether to include the members of subcategories
+  :param depth: The maximum number of subcategory levels to descend (defaults to no limit). Only used if `recursive` is True
+  :param threads: The number of categories to request at the same time
+  :type category: str
+  :type wiki: str
+  :type language: str
+  :type recursive: bool
+  :type depth: int
+  :type threads: int
+
+  :returns: generator of :class:`tuple` with the page title and page id
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+
+  if not category.lower().startswith("category:"):
+    category = "Category:" + category
+
+  def fetch(title):
+    query_params = {
+      'action': 'query',
+      'wiki': wiki,
+      'lang': language,
+      'list': 'categorymembers',
+      'cmtitle': title,
+      'cmprop': 'ids|title|type',
+      'cmlimit': 'max'
+    }
+    try:
+      return [
+        member
+        for request in u._continued_request(query_params)
+        for member in request['query']['categorymembers']
+      ]
+    except KeyError:
+      raise FandomError(title, wiki, language)
+
+  visited = {category}
+  seen = set()
+  level = [category]
+  level_depth = 0
+
+  with ThreadPoolExecutor(threads) as pool:
+    while level:
+      descend = recursive and (depth is None or level_depth < depth)
+      next_level = []
+
+      for future in as_completed([pool.submit(fetch, title) for title in level]):
+        for member in future.result():
+          if descend and member['type'] == 'subcat' and member['title'] not in visited:
+            visited.add(member['title'])
+            next_level.append(member['title'])
+
+          if member['pageid'] not in seen:
+            seen.add(member['pageid'])
+            yield (member['title'], member['pageid'])
+
+      level = next_level
+      level_depth += 1
+
+
 def random(pages : int = 1, wiki : str = WIKI, language : str = LANG):
   """
   Get a list of random fandom article titles.
@@ -158,7 +415,6 @@ def random(pages : int = 1, wiki : str = WIKI, language : str = LANG):
   return titles
 
 
-@u.cache
 def summary(title : str, wiki : str = WIKI, language : str = LANG, sentences : int = -1, redirect : bool = True):
   """
   Plain text summary of the page with the requested title.
@@ -199,7 +455,7 @@ def page(title : str = "", pageid : int = -1, wiki : str = WIKI, language : str
   :param wiki: The wiki to search (defaults to the global wiki variable. If the global wiki variable is not set, defaults to "runescape")
   :param language: The language to search in (defaults to the global language variable. If  the global language variable is not set, defaults to english)
   :param redirect: Allow redirection without raising RedirectError
-  :param preload: Load content, summary, images, references, and links during initialization
+  :param preload: Load content, summary, images, and sections during initialization
   :type title: str
   :type pageid: int
   :type wiki: str
@@ -212,8 +468,377 @@ def page(title : str = "", pageid : int = -1, wiki : str = WIKI, language : str
   language = language if language != "" else (LANG if LANG != "" else "en")
 
   if title != "":
-    return FandomPage(wiki, language, title=title, redirect=redirect, preload=preload)
+    fandom_page = _page(wiki, language, title, None, redirect)
   elif pageid != -1:
-    return FandomPage(wiki, language, pageid=pageid, preload=preload)
+    fandom_page = _page(wiki, language, None, pageid, True)
   else:
     raise ValueError("Either a title or a pageid must be specified")
+
+  if preload:
+    for prop in ('content', 'summary', 'images', 'sections'):
+      getattr(fandom_page, prop)
+
+  return fandom_page
+
+@u.cache.bounded(PAGE_CACHE_SIZE)
+def _page(wiki, language, title, pageid, redirect):
+  """
+  Shared FandomPage objects, so concurrent and repeated requests for the
+  same page load and parse it only once. Only the most recently used pages
+  are kept, see :class:`fandom.set_page_cache_size`.
+  """
+  return FandomPage(wiki, language, title=title, pageid=pageid, redirect=redirect)
+
+
+def _discard_page(title : str, wiki : str = WIKI, language : str = LANG, redirect : bool = True):
+  """
+  Drop a page from the page cache, so it's loaded again from scratch the
+  next time it's requested.
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+  _page.discard(wiki, language, title, None, redirect)
+
+
+def pages(titles : list, wiki : str = WIKI, language : str = LANG, redirect : bool = True, threads : int = 8, processes : int = None):
+  """
+  Get FandomPage objects for several pages at once, with their content already parsed.
+
+  The pages are loaded and their HTML downloaded on a pool of threads, while
+  the CPU-bound parsing of the HTML into :class:`FandomPage.content` and
+  :class:`FandomPage.infobox` is done on a pool of worker processes, so
+  parsing is not limited to a single core.
+  Only the parsed content is sent back from the workers. Pages that were
+  already parsed are not parsed again.
+
+  .. note::
+    The worker processes are spawned rather than forked, so scripts calling this with `processes` other than 0 need the `if __name__ == "__main__":` guard.
+
+  :param titles: The titles of the pages to load
+  :param wiki: The wiki to search (defaults to the global wiki variable. If the global wiki variable is not set, defaults to "runescape")
+  :param language: The language to search in (defaults to the global language variable. If  the global language variable is not set, defaults to english)
+  :param redirect: Allow redirection without raising RedirectError
+  :param threads: The number of threads used to download pages
+  :param processes: The number of processes used to parse pages (defaults to the number of CPUs). If 0, the pages are parsed in the calling process
+  :type titles: list
+  :type wiki: str
+  :type language: str
+  :type redirect: bool
+  :type threads: int
+  :type processes: int
+
+  :returns: :class:`list` of :class:`FandomPage`, in the same order as `titles`
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+
+  def fetch(title):
+    fandom_page = page(title, wiki=wiki, language=language, redirect=redirect)
+    # Pages are shared, so this one may have been parsed already
+    if not getattr(fandom_page, '_content', False):
+      fandom_page.html
+    return fandom_page
+
+  if processes == 0:
+    with ThreadPoolExecutor(threads) as io_pool:
+      loaded = list(io_pool.map(fetch, titles))
+    for fandom_page in loaded:
+      fandom_page.content
+    return loaded
+
+  # Imported here since they're only needed for parsing on several processes
+  import multiprocessing
+  from concurrent.futures import ProcessPoolExecutor
+
+  # The workers are started while the download threads are running, and
+  # forking a process with running threads can deadlock on locks they hold,
+  # so the workers are spawned as fresh processes instead
+  spawn = multiprocessing.get_context("spawn")
+
+  # Hand each page to the process pool as soon as its download finishes, so
+  # parsing overlaps with the remaining downloads
+  with ThreadPoolExecutor(threads) as io_pool, ProcessPoolExecutor(processes, mp_context=spawn) as cpu_pool:
+    downloads = [io_pool.submit(fetch, title) for title in titles]
+    parses = {}
+    for download in as_completed(downloads):
+      fandom_page = download.result()
+      if not getattr(fandom_page, '_content', False):
+        parses[download] = cpu_pool.submit(_parse_content, fandom_page.html, fandom_page.title)
+
+    loaded = []
+    for download in downloads:
+      fandom_page = download.result()
+      if download in parses:
+        content, infobox = parses[download].result()
+        with fandom_page._lock:
+          if not getattr(fandom_page, '_content', False):
+            fandom_page._set_content(content, infobox)
+      loaded.append(fandom_page)
+
+  return loaded
+
+
+def link_graph(pageids : list, wiki : str = WIKI, language : str = LANG, threads : int = 4):
+  """
+  Get the links between articles as an edge list.
+
+  The pages are requested in batches of 50. For each batch, the linked
+  articles are resolved to page ids with a `generator=links` query, and the
+  links of each page are fetched with a `prop=links` query. Links to pages
+  that don't exist are left out.
+
+  :param pageids: The page ids of the pages to get the outgoing links of
+  :param wiki: The wiki to search (defaults to the global wiki variable. If the global wiki variable is not set, defaults to "runescape")
+  :param language: The language to search in (defaults to the global language variable. If  the global language variable is not set, defaults to english)
+  :param threads: The number of batches to request at the same time
+  :type pageids: list
+  :type wiki: str
+  :type language: str
+  :type threads: int
+
+  :returns: :class:`tuple` of two :class:`array.array`, the source and target page id of each link
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+
+  def batch_edges(batch):
+    base_params = {
+      'action': 'query',
+      'wiki': wiki,
+      'lang': language,
+      'pageids': "|".join(str(pageid) for pageid in batch)
+    }
+
+    target_ids = {}
+    generator_params = dict(base_params, generator='links', gplnamespace=0, gpllimit='max')
+    for request in u._continued_request(generator_params):
+      for target in request.get('query', {}).get('pages', []):
+        if 'missing' not in target:
+          target_ids[target['title']] = target['pageid']
+
+    sources = array('q')
+    targets = array('q')
+    links_params = dict(base_params, prop='links', plnamespace=0, pllimit='max')
+    for request in u._continued_request(links_params):
+      for source in request.get('query', {}).get('pages', []):
+        for link in source.get('links', []):
+          if link['title'] in target_ids:
+            sources.append(source['pageid'])
+            targets.append(target_ids[link['title']])
+
+    return sources, targets
+
+  pageids = list(pageids)
+  batches = [pageids[i:i+50] for i in range(0, len(pageids), 50)]
+
+  sources = array('q')
+  targets = array('q')
+  with ThreadPoolExecutor(threads) as pool:
+    for batch_sources, batch_targets in pool.map(batch_edges, batches):
+      sources.extend(batch_sources)
+      targets.extend(batch_targets)
+
+  return sources, targets
+
+
+def _title_map(query):
+  """
+  Map each title in a query response to the title it ended up as, following
+  normalization and redirects.
+  """
+  renames = {}
+  for key in ('normalized', 'converted', 'redirects'):
+    for rename in query.get(key, []):
+      renames[rename['from']] = rename['to']
+
+  def final(title):
+    seen = set()
+    while title in renames and title not in seen:
+      seen.add(title)
+      title = renames[title]
+    return title
+
+  return {title: final(title) for title in renames}
+
+def resolve(titles : list, wiki : str = WIKI, language : str = LANG, threads : int = 4):
+  """
+  Find the canonical title and page id of many titles at once, following
+  normalization, language variant conversion and redirects.
+
+  The titles are resolved 50 at a time, and the results are kept in a
+  redirect map, so titles that were resolved before aren't requested again.
+
+  :param titles: The titles to resolve
+  :param wiki: The wiki to search (defaults to the global wiki variable. If the global wiki variable is not set, defaults to "runescape")
+  :param language: The language to search in (defaults to the global language variable. If  the global language variable is not set, defaults to english)
+  :param threads: The number of batches to request at the same time
+  :type titles: list
+  :type wiki: str
+  :type language: str
+  :type threads: int
+
+  :returns: :class:`dict` mapping each title to a :class:`dict` with the canonical 'title', the 'pageid' (None if the page doesn't exist) and whether the page is 'missing'
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+
+  def fetch(batch):
+    query_params = {
+      'action': 'query',
+      'wiki': wiki,
+      'lang': language,
+      'titles': "|".join(batch),
+      'redirects': True,
+      'converttitles': True
+    }
+    query = u._wiki_request(query_params).get('query', {})
+    renames = _title_map(query)
+
+    found = {}
+    for result in query.get('pages', []):
+      missing = 'missing' in result or 'invalid' in result
+      found[result['title']] = {
+        'title': result['title'],
+        'pageid': None if missing else result['pageid'],
+        'missing': missing
+      }
+
+    for title in batch:
+      final = renames.get(title, title)
+      REDIRECT_MAP[(wiki, language, title)] = found.get(final, {'title': final, 'pageid': None, 'missing': True})
+
+  unresolved = list(dict.fromkeys(title for title in titles if (wiki, language, title) not in REDIRECT_MAP))
+  batches = [unresolved[i:i+50] for i in range(0, len(unresolved), 50)]
+
+  with ThreadPoolExecutor(threads) as pool:
+    list(pool.map(fetch, batches))
+
+  return {title: REDIRECT_MAP[(wiki, language, title)] for title in titles}
+
+def wikitext_pages(titles : list, wiki : str = WIKI, language : str = LANG, redirect : bool = True, threads : int = 4):
+  """
+  Get WikitextPage objects for several pages at once, from their wikitext.
+
+  The wikitext is requested for 50 pages at a time, and the content,
+  sections and infoboxes of the pages are parsed from it, so the rendered
+  HTML is never downloaded. Pages that don't exist are left out.
+
+  :param titles: The titles of the pages to load
+  :param wiki: The wiki to search (defaults to the global wiki variable. If the global wiki variable is not set, defaults to "runescape")
+  :param language: The language to search in (defaults to the global language variable. If  the global language variable is not set, defaults to english)
+  :param redirect: Follow redirects. If False, redirects are returned as pages with the redirect as their wikitext
+  :param threads: The number of batches to request at the same time
+  :type titles: list
+  :type wiki: str
+  :type language: str
+  :type redirect: bool
+  :type threads: int
+
+  :returns: :class:`list` of :class:`fandom.WikitextPage`, in the same order as `titles`
+  """
+  wiki = wiki if wiki != "" else (WIKI if WIKI != "" else "runescape")
+  language = language if language != "" else (LANG if LANG != "" else "en")
+
+  def fetch(batch):
+    query_params = {
+      'action': 'query',
+      'wiki': wiki,
+      'lang': language,
+      'titles': "|".join(batch),
+      'prop': 'revisions',
+      'rvprop': 'ids|content',
+      'rvslots': 'main'
+    }
+    if redirect:
+      query_params['redirects'] = True
+
+    renames = {}
+    found = {}
+    for request in u._continued_request(query_params):
+      query = request.get('query', {})
+      renames.update(_title_map(query))
+      for result in query.get('pages', []):
+        if 'missing' in result or 'invalid' in result or 'revisions' not in result:
+          continue
+        revision = result['revisions'][0]
+        found[result['title']] = WikitextPage(
+          wiki, language, result['title'], result['pageid'], revision['revid'],
+          revision['slots']['main']['content']
+        )
+
+    return [found[renames.get(title, title)] for title in batch if renames.get(title, title) in found]
+
+  titles = list(titles)
+  batches = [titles[i:i+50] for i in range(0, len(titles), 50)]
+
+  with ThreadPoolExecutor(threads) as pool:
+    return [fandom_page for batch_pages in pool.map(fetch, batches) for fandom_page in batch_pages]
+
+
+def _fan_out(fn, targets, threads):
+  """
+  Call `fn` with each of `targets` concurrently. Returns a dict of each
+  target to its result, or to the exception it raised, so one failing
+  target doesn't affect the others.
+  """
+  def isolated(target):
+    try:
+      return fn(*target)
+    except Exception as e:
+      return e
+
+  with ThreadPoolExecutor(threads) as pool:
+    return dict(zip(targets, pool.map(isolated, targets)))
+
+def search_many(query : str, wikis : list = (), languages : list = (), results : int = 10, threads : int = 16):
+  """
+  Do the same fandom search on several wikis and/or in several languages at
+  the same time.
+
+  A failing search, for example because a wiki doesn't exist in a language,
+  doesn't affect the other searches. Its exception is returned in place of
+  its results.
+
+  :param query: What to search for
+  :param wikis: The wikis to search in (defaults to the global wiki variable)
+  :param languages: The languages to search in (defaults to the global language variable)
+  :param results: The maximum number of results to be returned from each wiki
+  :param threads: The number of searches to run at the same time
+  :type query: str
+  :type wikis: list
+  :type languages: list
+  :type results: int
+  :type threads: int
+
+  :returns: :class:`dict` mapping each (wiki, language) :class:`tuple` to a :class:`list` of :class:`tuple`, or to the :class:`Exception` raised by its search
+  """
+  wikis = wikis or [WIKI if WIKI != "" else "runescape"]
+  languages = languages or [LANG if LANG != "" else "en"]
+
+  targets = [(wiki, language) for wiki in wikis for language in languages]
+  return _fan_out(lambda wiki, language: search(query, wiki, language, results), targets, threads)
+
+def page_langlinks(title : str, wiki : str = WIKI, language : str = LANG, threads : int = 16):
+  """
+  Get the versions of a page in every other language it's linked to, loaded
+  at the same time.
+
+  A page that fails to load doesn't affect the others. Its exception is
+  returned in place of the page.
+
+  :param title: The title of the page
+  :param wiki: The wiki to search (defaults to the global wiki variable. If the global wiki variable is not set, defaults to "runescape")
+  :param language: The language to search in (defaults to the global language variable. If  the global language variable is not set, defaults to english)
+  :param threads: The number of pages to load at the same time
+  :type title: str
+  :type wiki: str
+  :type language: str
+  :type threads: int
+
+  :returns: :class:`dict` mapping each language to a :class:`FandomPage`, or to the :class:`Exception` raised while loading it
+  """
+  langlinks = page(title, wiki=wiki, language=language).langlinks
+
+  targets = [(link['wiki'], link_language, link['title']) for link_language, link in langlinks.items()]
+  loaded = _fan_out(lambda link_wiki, link_language, link_title: page(link_title, wiki=link_wiki, language=link_language), targets, threads)
+  return {link_language: result for (_, link_language, _), result in loaded.items()}
@@ -0,0 +1,127 @@
+"""
+A local full-text index of pages, for searching pages that were already
+fetched without going through the API.
+"""
+
+import re
+import sqlite3
+import threading
+
+class LocalIndex(object):
+  """
+  A full-text index of pages, stored in SQLite using FTS5.
+
+  Pages can be added manually with :class:`fandom.LocalIndex.add`, or
+  automatically as their content is parsed by passing the index to
+  :class:`fandom.set_local_index`. The index is searched with
+  `fandom.search(..., backend="local")`.
+
+  :param path: The path of the SQLite database to keep the index in. Defaults to an in-memory index
+  :type path: str
+  """
+
+  def __init__(self, path : str = ":memory:"):
+    self._connection = sqlite3.connect(path, check_same_thread=False)
+    self._lock = threading.Lock()
+    with self._lock, self._connection:
+      self._connection.execute(
+        "CREATE TABLE IF NOT EXISTS documents ("
+        "id INTEGER PRIMARY KEY, wiki TEXT, lang TEXT, pageid INTEGER, title TEXT, "
+        "UNIQUE (wiki, lang, pageid))"
+      )
+      self._connection.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS documents_text USING fts5(title, sections, text)"
+      )
+
+  def __len__(self):
+    with self._lock:
+      return self._connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+  @staticmethod
+  def _document(page):
+    # Reading the sections and text parses the content if it isn't parsed
+    # yet, and a parsed page is added to the local index, so this has to
+    # happen before the lock is taken
+    return (page.wiki, page.language, page.pageid, page.title, "\n".join(page.sections), page.plain_text)
+
+  def _add(self, document):
+    wiki, language, pageid, title, sections, text = document
+    cursor = self._connection.execute(
+      "SELECT id FROM documents WHERE wiki = ? AND lang = ? AND pageid = ?",
+      (wiki, language, pageid)
+    )
+    row = cursor.fetchone()
+    if row is None:
+      document_id = self._connection.execute(
+        "INSERT INTO documents (wiki, lang, pageid, title) VALUES (?, ?, ?, ?)",
+        (wiki, language, pageid, title)
+      ).lastrowid
+    else:
+      document_id = row[0]
+      self._connection.execute("UPDATE documents SET title = ? WHERE id = ?", (title, document_id))
+      self._connection.execute("DELETE FROM documents_text WHERE rowid = ?", (document_id,))
+
+    self._connection.execute(
+      "INSERT INTO documents_text (rowid, title, sections, text) VALUES (?, ?, ?, ?)",
+      (document_id, title, sections, text)
+    )
+
+  def add(self, page):
+    """
+    Add a page to the index, replacing it if it was already indexed.
+
+    :param page: The page to add
+    :type page: FandomPage
+    """
+    document = self._document(page)
+    with self._lock, self._connection:
+      self._add(document)
+
+  def add_many(self, pages):
+    """
+    Add several pages to the index in a single transaction.
+
+    :param pages: The pages to add
+    """
+    documents = [self._document(page) for page in pages]
+    with self._lock, self._connection:
+      for document in documents:
+        self._add(document)
+
+  def search(self, query : str, wiki : str, language : str, results : int = 10):
+    """
+    Search the indexed pages of a wiki. Every word in the query has to
+    match, and matches in titles rank higher than matches in section titles
+    or text.
+
+    :param query: What to search for
+    :param wiki: The wiki to search in
+    :param language: The language to search in
+    :param results: The maximum number of results to be returned
+    :type query: str
+    :type wiki: str
+    :type language: str
+    :type results: int
+
+    :returns: :class:`list` of :class:`tuple` with the page title and page id
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+      return []
+    match = " ".join('"{}"'.format(word) for word in words)
+
+    with self._lock:
+      rows = self._connection.execute(
+        "SELECT documents.title, documents.pageid FROM documents_text "
+        "JOIN documents ON documents.id = documents_text.rowid "
+        "WHERE documents_text MATCH ? AND documents.wiki = ? AND documents.lang = ? "
+        "ORDER BY bm25(documents_text, 10.0, 2.0, 1.0) LIMIT ?",
+        (match, wiki, language, results)
+      ).fetchall()
+
+    return [tuple(row) for row in rows]
+
+  def close(self):
+    """Close the underlying database."""
+    with self._lock:
+      self._connection.close()
@@ -0,0 +1,164 @@
+"""
+Background prefetching of pages into the page cache.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from fandom.fandom import page
+
+class Prefetcher(object):
+  """
+  Loads pages in the background, so they're already in the page cache used
+  by :class:`fandom.page` (with the requested properties loaded) by the time
+  they're needed.
+
+  Pages are fetched in order of priority, lowest value first. All requests
+  go through the same rate limiting as every other request (see
+  :class:`fandom.set_rate_limiting`), and `min_interval` can be used to
+  leave more of the budget for other requests. Prefetching can be paused
+  while foreground requests are being made.
+
+  .. note::
+    The page cache only keeps the most recently used pages. Prefetching more pages than it holds drops the earliest ones again, see :class:`fandom.set_page_cache_size`.
+
+  :param threads: The number of pages to fetch at the same time
+  :param min_interval: The minimum time between starting two page fetches, in seconds
+  :type threads: int
+  :type min_interval: float
+
+  :ivar errors: A dict of (wiki, language, title) to the exception raised while prefetching that page
+  """
+
+  def __init__(self, threads : int = 2, min_interval : float = 0):
+    self.min_interval = min_interval
+    self.errors = {}
+
+    self._queue = queue.PriorityQueue()
+    self._order = itertools.count()
+    self._pauses = 0
+    self._pause_lock = threading.Lock()
+    self._running = threading.Event()
+    self._running.set()
+    self._stopped = False
+    self._interval_lock = threading.Lock()
+    self._last_fetch = 0
+
+    self._workers = [threading.Thread(target=self._work, daemon=True) for _ in range(threads)]
+    for worker in self._workers:
+      worker.start()
+
+  def add(self, title : str, wiki : str = "", language : str = "", fields : tuple = ('content',), priority : int = 0):
+    """
+    Queue a page to be prefetched.
+
+    :param title: The title of the page, or a (title, pageid) tuple like the ones returned by :class:`fandom.search` and :class:`fandom.random`
+    :param wiki: The wiki of the page (defaults to the global wiki variable)
+    :param language: The language of the page (defaults to the global language variable)
+    :param fields: The FandomPage properties to load, like 'content', 'summary' or 'images'
+    :param priority: Pages with lower values are fetched first
+    :type wiki: str
+    :type language: str
+    :type fields: tuple
+    :type priority: int
+    """
+    if isinstance(title, tuple):
+      title = title[0]
+    self._queue.put((priority, next(self._order), (title, wiki, language, tuple(fields))))
+
+  def add_many(self, titles, wiki : str = "", language : str = "", fields : tuple = ('content',), priority : int = 0):
+    """
+    Queue several pages to be prefetched, with the same priority.
+
+    :param titles: The titles of the pages, or (title, pageid) tuples
+    :param wiki: The wiki of the pages (defaults to the global wiki variable)
+    :param language: The language of the pages (defaults to the global language variable)
+    :param fields: The FandomPage properties to load
+    :param priority: Pages with lower values are fetched first
+    :type wiki: str
+    :type language: str
+    :type fields: tuple
+    :type priority: int
+    """
+    for title in titles:
+      self.add(title, wiki, language, fields, priority)
+
+  def pause(self):
+    """
+    Stop starting new fetches until :class:`fandom.prefetch.Prefetcher.resume`
+    is called. Fetches that already started are finished.
+    """
+    with self._pause_lock:
+      self._pauses += 1
+      self._running.clear()
+
+  def resume(self):
+    """Undo a call to :class:`fandom.prefetch.Prefetcher.pause`."""
+    with self._pause_lock:
+      self._pauses = max(self._pauses - 1, 0)
+      if self._pauses == 0:
+        self._running.set()
+
+  @contextmanager
+  def paused(self):
+    """
+    Context manager that pauses prefetching while foreground work runs.
+    Can be nested and used from several threads at once, prefetching
+    resumes when the last one exits.
+    """
+    self.pause()
+    try:
+      yield self
+    finally:
+      self.resume()
+
+  def join(self):
+    """Wait until every queued page has been prefetched."""
+    self._queue.join()
+
+  def stop(self):
+    """
+    Stop the background threads. Pages still queued are not fetched, even
+    while prefetching is paused.
+    """
+    self._stopped = True
+    for _ in self._workers:
+      self._queue.put((float('-inf'), next(self._order), None))
+    # Wake up the workers waiting for a pause to end, so they can exit
+    self._running.set()
+    for worker in self._workers:
+      worker.join()
+
+  def _wait_for_interval(self):
+    with self._interval_lock:
+      wait = self._last_fetch + self.min_interval - time.monotonic()
+      if wait > 0:
+        time.sleep(wait)
+      self._last_fetch = time.monotonic()
+
+  def _work(self):
+    while True:
+      _, _, item = self._queue.get()
+      try:
+        if item is None:
+          return
+
+        self._running.wait()
+        # Workers that took a page before a pause drop it if stopped meanwhile
+        if self._stopped:
+          continue
+        if self.min_interval:
+          self._wait_for_interval()
+
+        title, wiki, language, fields = item
+        try:
+          fandom_page = page(title, wiki=wiki, language=language)
+          for field in fields:
+            getattr(fandom_page, field)
+        except Exception as e:
+          self.errors[(wiki, language, title)] = e
+      finally:
+        self._queue.task_done()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import importlib
+import unittest
+from unittest import mock
+
+import fandom
+import fandom.fandom as f
+
+# fandom.FandomPage is the class, not the module, once the package is imported
+fp = importlib.import_module('fandom.FandomPage')
+
+def fake_request(params):
+  if params.get('list') == 'search':
+    return {'query': {'search': [{'title': params['wiki'], 'pageid': 1}]}}
+  if params.get('list') == 'prefixsearch':
+    return {'query': {'prefixsearch': [{'title': params['pssearch'], 'pageid': 1}]}}
+  return {'parse': {'sections': [], 'text': ""}}
+
+class TestCache(unittest.TestCase):
+  """Test that the caches are kept per wiki, and are emptied by fandom.clear_cache."""
+
+  def setUp(self):
+    fandom.clear_cache()
+    patches = [
+      mock.patch('fandom.util._wiki_request', fake_request),
+      mock.patch.object(fp, '_wiki_request', fake_request)
+    ]
+    for patch in patches:
+      patch.start()
+      self.addCleanup(patch.stop)
+    self.addCleanup(fandom.clear_cache)
+
+  def test_switching_wiki(self):
+    """Test that switching the global wiki doesn't return results cached for another wiki."""
+    self.addCleanup(setattr, f, 'WIKI', f.WIKI)
+    fandom.set_wiki("starwars")
+    self.assertEqual(fandom.search("Grass"), [("starwars", 1)])
+    fandom.set_wiki("harrypotter")
+    self.assertEqual(fandom.search("Grass"), [("harrypotter", 1)])
+
+  def test_clear_cache(self):
+    """Test that fandom.clear_cache empties every cache."""
+    fandom.search("Grass", wiki="starwars")
+    fandom.suggest("Gra", wiki="starwars")
+    fp._section_indexes("starwars", "en", 1, 1)
+    fp._section_html("starwars", "en", 1, 1, "1")
+    f.REDIRECT_MAP[("starwars", "en", "Grass")] = {'title': "Grass", 'pageid': 1, 'missing': False}
+    with mock.patch.object(f, 'FandomPage', lambda *args, **kwargs: object()):
+      fandom.page("Grass", wiki="starwars")
+
+    fandom.clear_cache()
+
+    for cached in (f._search, f._page, fp._section_indexes, fp._section_html):
+      self.assertEqual(len(cached._cache), 0)
+    self.assertIsNone(f.SUGGEST_CACHE.get(("starwars", "en"), "Gra", 10))
+    self.assertEqual(f.REDIRECT_MAP, {})
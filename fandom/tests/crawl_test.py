@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+import fandom
+
+def html_response(status_code, html=""):
+  response = requests.models.Response()
+  response.status_code = status_code
+  response._content = html.encode('utf-8')
+  response.encoding = 'utf-8'
+  return response
+
+def fake_request(params):
+  return {'query': {'pages': [{'pageid': 1, 'title': params['titles']}]}}
+
+class TestCrawl(unittest.TestCase):
+  """Test the functionality of fandom.CrawlJob."""
+
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.directory.name, "crawl.sqlite")
+    self.crawled = []
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def handler(self, page):
+    self.crawled.append(page.title)
+    if page.title == "Grass":
+      return ["Moisture farm"]
+
+  def test_crawl(self):
+    """Test crawling pages, adding pages from the handler, and recording failures."""
+    job = fandom.CrawlJob(self.path, self.handler, wiki="starwars", backoff=0)
+    job.add(["Grass", "purpleberry"])
+    progress = job.run(threads=2)
+    job.close()
+
+    self.assertEqual(sorted(self.crawled), ["Grass", "Moisture farm"])
+    self.assertEqual(progress['done'], 2)
+    self.assertEqual(progress['failed'], 1)
+
+  def test_resume(self):
+    """Test that a new job on the same database skips completed pages."""
+    job = fandom.CrawlJob(self.path, self.handler, wiki="starwars")
+    job.add(["Moisture farm"])
+    job.run()
+    job.close()
+
+    resumed = fandom.CrawlJob(self.path, self.handler, wiki="starwars")
+    resumed.add(["Moisture farm", "Boba Fett"])
+    self.assertEqual(resumed.progress()['pending'], 1)
+    resumed.run()
+    resumed.close()
+    self.assertEqual(self.crawled, ["Moisture farm", "Boba Fett"])
+
+  def test_transient_failure(self):
+    """Test that a page whose download fails once is downloaded again and crawled on the retry."""
+    fandom.clear_cache()
+    self.addCleanup(fandom.clear_cache)
+    responses = [
+      html_response(503, "<html>Service Unavailable</html>"),
+      html_response(200, '<div class="mw-parser-output"><p>Grass is a plant.</p></div>')
+    ]
+
+    with mock.patch('fandom.util._uncoalesced_wiki_request', fake_request), \
+         mock.patch('requests.get', side_effect=responses) as get:
+      job = fandom.CrawlJob(self.path, lambda page: self.crawled.append(page.title), wiki="starwars", backoff=0)
+      job.add(["Grass"])
+      progress = job.run()
+      job.close()
+
+    self.assertEqual(get.call_count, 2)
+    self.assertEqual(self.crawled, ["Grass"])
+    self.assertEqual(progress['done'], 1)
+    self.assertEqual(progress['failed'], 0)
+
+  def test_handler_results(self):
+    """Test that a handler can return a single title, and that a bad return value only fails its page."""
+    results = {"Grass": "Moisture farm", "Moisture farm": 42}
+    fandom.clear_cache()
+    self.addCleanup(fandom.clear_cache)
+
+    with mock.patch('fandom.util._uncoalesced_wiki_request', fake_request):
+      job = fandom.CrawlJob(self.path, lambda page: results[page.title], wiki="starwars", fields=(), max_retries=1)
+      job.add("Grass")
+      progress = job.run()
+      failures = job.failures()
+      job.close()
+
+    self.assertEqual(progress['done'], 1)
+    self.assertEqual(progress['failed'], 1)
+    self.assertIn("TypeError", failures["Moisture farm"])
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+from unittest import mock
+
+import fandom
+
+DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/" version="0.11" xml:lang="en">
+  <siteinfo>
+    <sitename>Harry Potter Wiki</sitename>
+    <base>https://harrypotter.fandom.com/wiki/Main_Page</base>
+  </siteinfo>
+  <page>
+    <title>Hedwig</title>
+    <ns>0</ns>
+    <id>1234</id>
+    <revision>
+      <id>99</id>
+      <text xml:space="preserve">{{Infobox creature
+|name = Hedwig
+|image = [[File:Hedwig.png]]
+|species = [[Snowy owl]]
+}}
+'''Hedwig''' was a [[Snowy owl|snowy owl]] owned by [[Harry Potter]].&lt;ref&gt;Book&lt;/ref&gt;
+
+== Biography ==
+Hedwig was bought in [[Diagon Alley]].
+=== Death ===
+She died in 1997.
+== Behind the scenes ==
+* Played by several owls.
+[[Category:Owls]]</text>
+    </revision>
+  </page>
+  <page>
+    <title>Hedwig (owl)</title>
+    <ns>0</ns>
+    <id>1235</id>
+    <redirect title="Hedwig" />
+    <revision>
+      <id>100</id>
+      <text xml:space="preserve">#REDIRECT [[Hedwig]]</text>
+    </revision>
+  </page>
+  <page>
+    <title>Talk:Hedwig</title>
+    <ns>1</ns>
+    <id>1236</id>
+    <revision>
+      <id>101</id>
+      <text xml:space="preserve">Talk</text>
+    </revision>
+  </page>
+</mediawiki>
+"""
+
+class TestDump(unittest.TestCase):
+  """Test reading pages from an XML dump without using the network."""
+
+  def setUp(self):
+    self.pages = list(fandom.read_dump(io.BytesIO(DUMP.encode("utf-8"))))
+    self.hedwig = self.pages[0]
+
+  def test_filtering(self):
+    """Test that redirects and other namespaces are skipped by default."""
+    self.assertEqual(len(self.pages), 1)
+    every_page = list(fandom.read_dump(io.BytesIO(DUMP.encode("utf-8")), namespaces=(), redirects=True))
+    self.assertEqual(len(every_page), 3)
+
+  def test_page_info(self):
+    """Test the basic page information."""
+    self.assertIsInstance(self.hedwig, fandom.FandomPage)
+    self.assertEqual(self.hedwig.title, "Hedwig")
+    self.assertEqual(self.hedwig.pageid, 1234)
+    self.assertEqual(self.hedwig.revision_id, 99)
+    self.assertEqual(self.hedwig.url, "https://harrypotter.fandom.com/en/wiki/Hedwig")
+
+  def test_content(self):
+    """Test the content parsed from the wikitext."""
+    self.assertEqual(self.hedwig.summary, "Hedwig was a snowy owl owned by Harry Potter.")
+    self.assertEqual(self.hedwig.sections, ["Biography", "Death", "Behind the scenes"])
+    self.assertEqual(self.hedwig.section("Death"), "Death\nShe died in 1997.")
+    self.assertNotIn("Category", self.hedwig.plain_text)
+
+  def test_infobox(self):
+    """Test the infobox parsed from the template parameters."""
+    self.assertEqual(self.hedwig.infobox[0]['data']['species'], "Snowy owl")
+    self.assertEqual(self.hedwig.infobox[0]['images'], ["Hedwig.png"])
+
+  def test_blank_page(self):
+    """Test that a page with empty wikitext is parsed without any request."""
+    blank = fandom.WikitextPage("harrypotter", "en", "Blank", 1237, 102, "")
+    with mock.patch('fandom.util._uncoalesced_wiki_request', side_effect=AssertionError("request made")):
+      self.assertEqual(blank.content, {'title': "Blank", 'content': ""})
+      self.assertEqual(blank.infobox, [])
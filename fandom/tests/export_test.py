@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+import fandom
+
+WIKITEXT = """'''Hedwig''' was a snowy owl.
+== Biography ==
+Hedwig was bought in [[Diagon Alley]].
+=== Death ===
+She died in 1997."""
+
+class TestExport(unittest.TestCase):
+  """Test exporting pages without using the network."""
+
+  def setUp(self):
+    self.pages = [
+      fandom.WikitextPage("harrypotter", "en", "Hedwig", 1234, 99, WIKITEXT),
+      fandom.WikitextPage("harrypotter", "en", "Errol", 1235, 100, "'''Errol''' was an owl.")
+    ]
+    self.directory = tempfile.TemporaryDirectory()
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_record(self):
+    """Test the flat record of a page."""
+    record = fandom.export.page_record(self.pages[0])
+    self.assertEqual(record['revision_id'], 99)
+    self.assertEqual(record['sections'], [
+      {'title': "Biography", 'level': 2, 'content': "Hedwig was bought in Diagon Alley."},
+      {'title': "Death", 'level': 3, 'content': "She died in 1997."}
+    ])
+
+  def test_jsonl(self):
+    """Test writing a compressed JSON Lines file."""
+    path = os.path.join(self.directory.name, "pages.jsonl.gz")
+    self.assertEqual(fandom.write_jsonl(iter(self.pages), path), 2)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+      records = [json.loads(line) for line in f]
+    self.assertEqual([r['title'] for r in records], ["Hedwig", "Errol"])
+
+  def test_parquet(self):
+    """Test writing a Parquet file in several row groups."""
+    try:
+      import pyarrow.parquet
+    except ImportError:
+      self.skipTest("pyarrow is not installed")
+
+    path = os.path.join(self.directory.name, "pages.parquet")
+    self.assertEqual(fandom.write_parquet(self.pages, path, batch_size=1), 2)
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    self.assertEqual(parquet_file.num_row_groups, 2)
+    self.assertEqual(parquet_file.read().column('pageid').to_pylist(), [1234, 1235])
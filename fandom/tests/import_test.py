@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Generous upper bound for the cumulative import time of the package, in
+# microseconds. Importing fandom took ~150ms before its heavy dependencies
+# were made lazy, and takes ~30ms after.
+IMPORT_TIME_BUDGET = 100000
+
+def run_python(code, *options):
+  return subprocess.run(
+    [sys.executable, *options, "-c", code],
+    cwd=ROOT, capture_output=True, text=True, check=True
+  )
+
+class TestImport(unittest.TestCase):
+  """Test that importing fandom stays cheap."""
+
+  def test_lazy_dependencies(self):
+    """Test that heavy dependencies aren't imported until they're needed."""
+    result = run_python(
+      "import sys, fandom; "
+      "print(' '.join(m for m in ('bs4', 'requests', 'multiprocessing', 'mimetypes') if m in sys.modules))"
+    )
+    self.assertEqual(result.stdout.strip(), "")
+
+  def test_import_time(self):
+    """Test the cumulative import time of the package, as reported by -X importtime."""
+    result = run_python("import fandom", "-X", "importtime")
+    package_line = [line for line in result.stderr.splitlines() if line.endswith("| fandom")][-1]
+    cumulative = int(package_line.split("|")[1])
+    self.assertLess(cumulative, IMPORT_TIME_BUDGET)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import fandom
+
+class TestLocalIndex(unittest.TestCase):
+  """Test searching pages in a local index without using the network."""
+
+  def setUp(self):
+    self.index = fandom.LocalIndex()
+    fandom.set_local_index(self.index)
+    self.hedwig = fandom.WikitextPage("harrypotter", "en", "Hedwig", 1234, 99,
+      "'''Hedwig''' was a snowy owl.\n== Biography ==\nShe was bought in Diagon Alley.")
+    self.errol = fandom.WikitextPage("harrypotter", "en", "Errol", 1235, 100,
+      "'''Errol''' was an old owl owned by the Weasleys.")
+    self.hedwig.content
+    self.errol.content
+
+  def tearDown(self):
+    fandom.set_local_index(None)
+    self.index.close()
+
+  def test_indexed_on_parse(self):
+    """Test that pages are added to the index when their content is parsed."""
+    self.assertEqual(len(self.index), 2)
+    self.index.add(self.hedwig)
+    self.assertEqual(len(self.index), 2)
+
+  def test_add_unparsed(self):
+    """Test adding a page whose content isn't parsed yet while the index is set."""
+    hermes = fandom.WikitextPage("harrypotter", "en", "Hermes", 1236, 101,
+      "'''Hermes''' was the owl of Percy Weasley.")
+    self.index.add(hermes)
+    self.assertEqual(len(self.index), 3)
+    self.assertEqual(fandom.search("Percy", wiki="harrypotter", backend="local"), [("Hermes", 1236)])
+
+  def test_local_search(self):
+    """Test searching the local index through fandom.search."""
+    self.assertEqual(set(fandom.search("owl", wiki="harrypotter", backend="local")), {("Errol", 1235), ("Hedwig", 1234)})
+    self.assertEqual(fandom.search("Diagon alley", wiki="harrypotter", backend="local"), [("Hedwig", 1234)])
+    self.assertEqual(fandom.search("hedwig", wiki="harrypotter", backend="local")[0], ("Hedwig", 1234))
+    self.assertEqual(fandom.search("owl", wiki="starwars", backend="local"), [])
+
+  def test_no_index(self):
+    """Test that a local search without an index raises an error."""
+    fandom.set_local_index(None)
+    self.assertRaises(ValueError, lambda: fandom.search("owl", wiki="harrypotter", backend="local"))
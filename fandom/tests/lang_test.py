@@ -22,3 +22,9 @@ class TestLang(unittest.TestCase):
     fandom.set_wiki("runescape")
     rp = lambda: fandom.page("runes")
     self.assertRaises(fandom.error.RequestError, rp)
+
+  def test_langlinks(self):
+    """Test loading the versions of a page in other languages."""
+    translations = fandom.page_langlinks("Harry Potter", wiki="harrypotter", language="en")
+    self.assertIn("nl", translations)
+    self.assertEqual(translations["nl"].language, "nl")
@@ -2,6 +2,7 @@
 import unittest
 
 import fandom
+from fandom.FandomPage import _parse_content
 
 class TestPageSetUp(unittest.TestCase):
   """Test the functionality of fandom.page's __init__ and load functions."""
@@ -46,6 +47,14 @@ class TestPageSetUp(unittest.TestCase):
     self.assertEqual(capital_party.title, "Stormcloaks")
     self.assertEqual(capital_party, lower_party)
 
+  def test_resolve(self):
+    """Test resolving redirects and normalization for several titles at once."""
+    resolved = fandom.resolve(["Professor Slughorn", "horace Slughorn", "purpleberry"], wiki="harrypotter")
+    self.assertEqual(resolved["Professor Slughorn"]["title"], "Horace Slughorn")
+    self.assertEqual(resolved["Professor Slughorn"], resolved["horace Slughorn"])
+    self.assertTrue(resolved["purpleberry"]["missing"])
+    self.assertIsNone(resolved["purpleberry"]["pageid"])
+
 class TestPage(unittest.TestCase):
   """Test the functionality of the rest of fandom.page."""
 
@@ -59,6 +68,10 @@ class TestPage(unittest.TestCase):
     """Test loading from a page id"""
     self.assertEqual(self.grass, fandom.page(wiki="starwars", pageid=508340))
 
+  def test_shared_page(self):
+    """Test that loading the same page again returns the same object."""
+    self.assertIs(self.grass, fandom.page(wiki="starwars", title="Grass"))
+
   def test_title(self):
     """Test the title."""
     self.assertEqual(self.grass.title, "Grass")
@@ -96,6 +109,26 @@ class TestPage(unittest.TestCase):
   def test_no_images(self):
     self.assertEqual(0, len(self.holden_ledbury.images))
 
+  def test_links(self):
+    """Test the lists of links, backlinks and categories."""
+    self.assertLessEqual(1, len(self.Boba_Fett.links))
+    self.assertLessEqual(1, len(self.Boba_Fett.backlinks))
+    self.assertLessEqual(1, len(self.Boba_Fett.categories))
+
+  def test_link_graph(self):
+    """Test building the link graph of a few pages."""
+    sources, targets = fandom.link_graph([self.grass.pageid, self.moisture_farm.pageid], wiki="starwars")
+    self.assertEqual(len(sources), len(targets))
+    self.assertEqual(set(sources), {self.grass.pageid, self.moisture_farm.pageid})
+
+  def test_wikitext(self):
+    """Test the raw wikitext, and loading pages from their wikitext in bulk."""
+    self.assertIsInstance(self.grass.wikitext, str)
+    loaded = fandom.wikitext_pages(["Grass", "Moisture farm", "purpleberry"], wiki="starwars")
+    self.assertEqual([p.title for p in loaded], ["Grass", "Moisture farm"])
+    self.assertEqual(loaded[0].wikitext, self.grass.wikitext)
+    self.assertIsInstance(loaded[1].content, dict)
+
   def test_html(self):
     """Test the full HTML property."""
     self.assertIsInstance(self.grass.html, str)
@@ -109,7 +142,36 @@ class TestPage(unittest.TestCase):
     self.assertIsInstance(self.Boba_Fett.section("survival"), str)
     self.assertEqual(self.Boba_Fett.section("sexual encounter with the sarlacc"), None)
 
+  def test_section_fetch(self):
+    """Test that fetching a single section gives the same text as the full page."""
+    # Other tests may have loaded the content of the shared page already
+    fandom.clear_cache()
+    boba_fett = fandom.page(wiki="starwars", title="Boba Fett")
+    fetched = boba_fett.section("survival")
+    self.assertEqual(boba_fett.section("sexual encounter with the sarlacc"), None)
+    self.assertFalse(hasattr(boba_fett, '_content'))
+    boba_fett.content
+    self.assertEqual(fetched, boba_fett.section("survival"))
+
   def test_infobox(self):
     """Test if page has an infobox"""
     self.assertIn('infobox', self.grass.content)
     self.assertNotIn('infobox', self.moisture_farm.content)
+
+  def test_structured_infobox(self):
+    """Test the structured infobox data."""
+    self.assertIsInstance(self.grass.infobox, list)
+    self.assertEqual(1, len(self.grass.infobox))
+    self.assertIsInstance(self.grass.infobox[0]['data'], dict)
+    self.assertEqual([], self.moisture_farm.infobox)
+
+  def test_pages(self):
+    """Test loading several pages with their content parsed in worker processes."""
+    # The pages are shared, so start from unparsed ones to have them parsed by the workers
+    fandom.clear_cache()
+    loaded = fandom.pages(["Grass", "Moisture farm"], wiki="starwars", processes=2)
+    self.assertEqual([p.title for p in loaded], ["Grass", "Moisture farm"])
+    for fandom_page in loaded:
+      content, infobox = _parse_content(fandom_page.html, fandom_page.title)
+      self.assertEqual(fandom_page.content, content)
+      self.assertEqual(fandom_page.infobox, infobox)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+from unittest import mock
+
+import fandom
+
+class TestPrefetch(unittest.TestCase):
+  """Test the functionality of fandom.Prefetcher."""
+
+  def setUp(self):
+    self.prefetcher = fandom.Prefetcher(threads=2)
+
+  def tearDown(self):
+    self.prefetcher.stop()
+
+  def test_prefetch(self):
+    """Test that prefetched pages are cached with their properties loaded."""
+    self.prefetcher.add_many(fandom.search("wands", wiki="harrypotter", results=3), wiki="harrypotter", fields=('content', 'summary'))
+    self.prefetcher.join()
+    self.assertEqual(self.prefetcher.errors, {})
+    title, _ = fandom.search("wands", wiki="harrypotter", results=3)[0]
+    self.assertIn('_summary', vars(fandom.page(title, wiki="harrypotter")))
+
+  def test_errors(self):
+    """Test that failing pages are recorded instead of stopping the prefetcher."""
+    with self.prefetcher.paused():
+      self.prefetcher.add("purpleberry", wiki="harrypotter")
+      self.prefetcher.add("Grass", wiki="starwars", priority=1)
+    self.prefetcher.join()
+    self.assertIsInstance(self.prefetcher.errors[("harrypotter", "", "purpleberry")], fandom.error.PageError)
+
+  def test_stop_while_paused(self):
+    """Test that pages taken by the workers while paused aren't fetched after stopping."""
+    with mock.patch('fandom.prefetch.page') as page:
+      self.prefetcher.pause()
+      self.prefetcher.add_many(["A", "B", "C"], wiki="starwars")
+      # Wait for both workers to take a page and block on the pause
+      while self.prefetcher._queue.qsize() > 1:
+        time.sleep(0.01)
+      self.prefetcher.stop()
+    page.assert_not_called()
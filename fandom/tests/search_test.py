@@ -20,6 +20,42 @@ class TestSearch(unittest.TestCase):
     self.assertIsInstance(search, list)
     self.assertEqual(len(search), 3)
 
+  def test_search_iter(self):
+    """Test streaming search results past a single request."""
+    search = list(fandom.search_iter("wand", wiki = "harrypotter", language = "en", results=600))
+    self.assertEqual(len(search), 600)
+    self.assertIsInstance(search[0], tuple)
+    self.assertEqual(len(set(search)), 600)
+
+  def test_search_batch(self):
+    """Test running several searches at once."""
+    searches = fandom.search_batch(["wands", "Albus Dumbledore"], wiki = "harrypotter", language = "en", results=3)
+    self.assertEqual(len(searches), 2)
+    self.assertEqual(searches[0], fandom.search("wands", wiki = "harrypotter", language = "en", results=3))
+
+  def test_suggest(self):
+    """Test prefix suggestions, and answering a longer prefix from the cache."""
+    suggestions = fandom.suggest("Albus Dumbl", wiki = "harrypotter", language = "en", results=50)
+    self.assertIsInstance(suggestions, list)
+    self.assertTrue(all(title.lower().startswith("albus dumbl") for title, _ in suggestions))
+    longer = fandom.suggest("Albus Dumbledore", wiki = "harrypotter", language = "en", results=50)
+    self.assertTrue(set(longer) <= set(suggestions))
+
+  def test_category_members(self):
+    """Test listing the members of a category and its subcategories."""
+    direct = list(fandom.category_members("Wands", wiki = "harrypotter", recursive=False))
+    nested = list(fandom.category_members("Wands", wiki = "harrypotter", depth=1))
+    self.assertIsInstance(direct[0], tuple)
+    self.assertTrue(set(direct) <= set(nested))
+    self.assertEqual(len(nested), len(set(nested)))
+
+  def test_search_many(self):
+    """Test searching several wikis at once, with a failing wiki isolated from the rest."""
+    searches = fandom.search_many("wand", wikis = ["harrypotter", "starwars"], languages = ["en", "ln"], results=3)
+    self.assertEqual(len(searches), 4)
+    self.assertEqual(len(searches[("harrypotter", "en")]), 3)
+    self.assertIsInstance(searches[("harrypotter", "ln")], fandom.error.FandomException)
+
   def test_random(self):
     """Test the random function."""
     random1 = fandom.random(wiki = "runescape")
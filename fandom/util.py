@@ -3,7 +3,9 @@ from __future__ import print_function, unicode_literals
 import sys
 import functools
 import time
-import requests
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime
 
 from fandom.error import HTTPTimeoutError, RequestError
@@ -13,6 +15,8 @@ USER_AGENT = 'fandom (https://github.com/NikolajDanger/fandom-py/)'
 RATE_LIMIT = False
 RATE_LIMIT_MIN_WAIT = None
 RATE_LIMIT_LAST_CALL = None
+RATE_LIMIT_LOCK = threading.Lock()
+LOCAL_INDEX = None
 
 def debug(fn):
   def wrapper(*args, **kwargs):
@@ -24,24 +28,152 @@ def debug(fn):
   return wrapper
 
 
+class single_flight(object):
+  """
+  Coalesces concurrent calls with the same key into a single call. Callers
+  arriving while a call for their key is running wait for it and get its
+  result (or its exception) instead of making the call again.
+  """
+
+  def __init__(self):
+    self._calls = {}
+    self._lock = threading.Lock()
+
+  def do(self, key, fn, *args, **kwargs):
+    with self._lock:
+      call = self._calls.get(key)
+      leader = call is None
+      if leader:
+        call = self._calls[key] = Future()
+
+    if not leader:
+      return call.result()
+
+    try:
+      call.set_result(fn(*args, **kwargs))
+    except BaseException as e:
+      call.set_exception(e)
+    finally:
+      with self._lock:
+        del self._calls[key]
+
+    return call.result()
+
+
 class cache(object):
+  """
+  Caches the results of a function by its arguments. With a `maxsize`, only
+  that many results are kept, and the least recently used ones are dropped
+  first (see :class:`fandom.util.cache.bounded`).
+  """
 
-  def __init__(self, fn):
+  def __init__(self, fn, maxsize=None):
     self.fn = fn
-    self._cache = {}
+    self.maxsize = maxsize
+    self._cache = OrderedDict()
+    self._lock = threading.Lock()
+    self._flight = single_flight()
     functools.update_wrapper(self, fn)
 
+  @classmethod
+  def bounded(cls, maxsize):
+    return lambda fn: cls(fn, maxsize)
+
+  @staticmethod
+  def _key(args, kwargs):
+    return str(args) + str(kwargs)
+
   def __call__(self, *args, **kwargs):
-    key = str(args) + str(kwargs)
-    if key in self._cache:
-      ret = self._cache[key]
-    else:
-      ret = self._cache[key] = self.fn(*args, **kwargs)
+    key = self._key(args, kwargs)
+    with self._lock:
+      if key in self._cache:
+        self._cache.move_to_end(key)
+        return self._cache[key]
+    return self._flight.do(key, self._fill, key, args, kwargs)
+
+  def _fill(self, key, args, kwargs):
+    with self._lock:
+      if key in self._cache:
+        return self._cache[key]
+
+    value = self.fn(*args, **kwargs)
+    with self._lock:
+      self._cache[key] = value
+      self._trim()
+    return value
+
+  def _trim(self):
+    if self.maxsize is not None:
+      while len(self._cache) > self.maxsize:
+        self._cache.popitem(last=False)
 
-    return ret
+  def resize(self, maxsize):
+    with self._lock:
+      self.maxsize = maxsize
+      self._trim()
+
+  def discard(self, *args, **kwargs):
+    """Drop the cached result for the given arguments, if there is one."""
+    with self._lock:
+      self._cache.pop(self._key(args, kwargs), None)
 
   def clear_cache(self):
-    self._cache = {}
+    with self._lock:
+      self._cache = OrderedDict()
+
+
+class PrefixCache(object):
+  """
+  A trie of prefix search results.
+
+  Results are stored on the node for their prefix together with whether
+  they were complete (every match was returned). A lookup that misses can
+  still be answered from the deepest complete result of a shorter prefix,
+  by filtering it locally, since the matches for "harry" are a subset of
+  the matches for "harr".
+  """
+
+  def __init__(self):
+    self._tries = {}
+    self._lock = threading.Lock()
+
+  @staticmethod
+  def _normalize(prefix):
+    return prefix.replace("_", " ").lower()
+
+  def get(self, namespace, prefix, limit):
+    prefix = self._normalize(prefix)
+    with self._lock:
+      node = self._tries.get(namespace)
+      ancestor = None
+      for character in prefix:
+        if node is None:
+          break
+        if node[1] is not None and node[1][1]:
+          ancestor = node[1][0]
+        node = node[0].get(character)
+
+    if node is not None and node[1] is not None:
+      results, complete = node[1]
+      if complete or len(results) >= limit:
+        return results[:limit]
+
+    if ancestor is not None:
+      matches = [r for r in ancestor if self._normalize(r[0]).startswith(prefix)]
+      return matches[:limit]
+
+    return None
+
+  def put(self, namespace, prefix, results, complete):
+    with self._lock:
+      node = self._tries.setdefault(namespace, [{}, None])
+      for character in self._normalize(prefix):
+        node = node[0].setdefault(character, [{}, None])
+      node[1] = (list(results), complete)
+
+  def clear(self):
+    with self._lock:
+      self._tries = {}
 
 
 # from http://stackoverflow.com/questions/3627793/best-output-type-and-encoding-practices-for-repr-functions
@@ -51,43 +183,79 @@ def stdout_encode(u, default='UTF8'):
     return u.encode(encoding).decode(encoding)
   return u.encode(encoding)
 
+REQUESTS_IN_FLIGHT = single_flight()
+JSON_LOADS = None
+
+def _json_loads(content):
+  """
+  Decode a JSON response, using orjson if it's installed since it's much
+  faster than the standard library decoder.
+  """
+  global JSON_LOADS
+
+  if JSON_LOADS is None:
+    try:
+      import orjson
+      JSON_LOADS = orjson.loads
+    except ImportError:
+      import json
+      JSON_LOADS = json.loads
+
+  return JSON_LOADS(content)
+
 def _wiki_request(params):
   """
   Make a request to the fandom API using the given search parameters.
   Returns a parsed dict of the JSON response.
+
+  Identical requests made at the same time from several threads only go
+  to the server once, and share the response.
   """
+  key = tuple(sorted((name, str(value)) for name, value in params.items()))
+  return REQUESTS_IN_FLIGHT.do(key, _uncoalesced_wiki_request, params)
+
+def _uncoalesced_wiki_request(params):
   global RATE_LIMIT_LAST_CALL
   global USER_AGENT
 
   api_url = API_URL.format(**params)
   params = params.copy()
   params['format'] = 'json'
-  headers = {
-    'User-Agent': USER_AGENT
-  }
-
-  if RATE_LIMIT and RATE_LIMIT_LAST_CALL and \
-    RATE_LIMIT_LAST_CALL + RATE_LIMIT_MIN_WAIT > datetime.now():
-
-    # it hasn't been long enough since the last API call
-    # so wait until we're in the clear to make the request
-
-    wait_time = (RATE_LIMIT_LAST_CALL + RATE_LIMIT_MIN_WAIT) - datetime.now()
-    time.sleep(int(wait_time.total_seconds()))
+  # The compact response format: pages come as a list instead of a dict
+  # keyed by page id, and flags are booleans
+  params['formatversion'] = 2
 
   params.pop("wiki")
   params.pop("lang")
-  r = requests.get(api_url, params=params, headers=headers)
 
   if RATE_LIMIT:
-    RATE_LIMIT_LAST_CALL = datetime.now()
+    # Requests may come from several threads at once (see fandom.pages), so
+    # the wait and the timestamp update have to happen atomically
+    with RATE_LIMIT_LOCK:
+      if RATE_LIMIT_LAST_CALL and \
+        RATE_LIMIT_LAST_CALL + RATE_LIMIT_MIN_WAIT > datetime.now():
+
+        # it hasn't been long enough since the last API call
+        # so wait until we're in the clear to make the request
+
+        wait_time = (RATE_LIMIT_LAST_CALL + RATE_LIMIT_MIN_WAIT) - datetime.now()
+        time.sleep(max(wait_time.total_seconds(), 0))
+
+      RATE_LIMIT_LAST_CALL = datetime.now()
+
+  # requests is slow to import, so it's only imported once the first request is made
+  import requests
+  headers = {
+    'User-Agent': USER_AGENT
+  }
+  r = requests.get(api_url, params=params, headers=headers)
 
   if r.status_code == 404:
     raise RequestError(api_url, params)
 
   # If getting the json representation did not work, our data is mangled
   try:
-    r = r.json()
+    r = _json_loads(r.content)
   except:
     raise RequestError(api_url, params)
   # If we got a json response, then we know the format of the input was correct
@@ -97,3 +265,24 @@ def _wiki_request(params):
       raise HTTPTimeoutError(params["query"])
     raise RequestError(api_url, params)
   return r
+
+def _continued_request(params):
+  """
+  Make a request to the fandom API and keep following the continuation
+  returned by the API, yielding the parsed response of each request.
+
+  Based on https://www.mediawiki.org/wiki/API:Query#Continuing_queries
+  """
+  last_continue = {}
+
+  while True:
+    request_params = params.copy()
+    request_params.update(last_continue)
+
+    request = _wiki_request(request_params)
+    yield request
+
+    if 'continue' not in request:
+      break
+
+    last_continue = request['continue']
@@ -0,0 +1,242 @@
+"""
+Parsing of raw wikitext into the same structures FandomPage builds from the
+rendered HTML, for when the HTML isn't available or is too expensive to get.
+"""
+
+import re
+import threading
+
+from fandom.FandomPage import FandomPage, STANDARD_URL, _clean_content
+
+HEADING = re.compile(r'^(={1,6})\s*(.+?)\s*\1\s*$')
+COMMENT = re.compile(r'<!--.*?(-->|$)', re.S)
+REFERENCE = re.compile(r'<ref[^>/]*/>|<ref[^>]*>.*?</ref>', re.S | re.I)
+BREAK = re.compile(r'<br\s*/?>', re.I)
+HTML_TAG = re.compile(r'</?[a-zA-Z][^>]*>')
+EXTERNAL_LINK = re.compile(r'\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]')
+EMPHASIS = re.compile(r"'{2,}")
+MAGIC_WORD = re.compile(r'__[A-Z]+__')
+LIST_MARKER = re.compile(r'^[*#:;]+\s*', re.M)
+HIDDEN_LINK = re.compile(r'^(file|image|category|media):', re.I)
+FILE_LINK = re.compile(r'\[\[\s*(?:file|image):([^|\]]+)', re.I)
+
+def _split_top_level(text, separator='|'):
+  """Split on `separator`, ignoring separators inside nested links and templates."""
+  parts = []
+  depth = 0
+  start = 0
+  i = 0
+  while i < len(text):
+    pair = text[i:i+2]
+    if pair in ('{{', '[['):
+      depth += 1
+      i += 2
+    elif pair in ('}}', ']]'):
+      depth -= 1
+      i += 2
+    elif text[i] == separator and depth == 0:
+      parts.append(text[start:i])
+      start = i = i + 1
+    else:
+      i += 1
+  parts.append(text[start:])
+  return parts
+
+def _replace_nested(text, opening, closing, replace):
+  """
+  Replace every outermost `opening`...`closing` block (which may contain
+  nested blocks) with the result of calling `replace` on its inner text.
+  """
+  result = []
+  depth = 0
+  start = 0
+  last = 0
+  i = 0
+  while i < len(text):
+    if text.startswith(opening, i):
+      if depth == 0:
+        result.append(text[last:i])
+        start = i + len(opening)
+      depth += 1
+      i += len(opening)
+    elif depth and text.startswith(closing, i):
+      depth -= 1
+      i += len(closing)
+      if depth == 0:
+        result.append(replace(text[start:i-len(closing)]))
+        last = i
+    else:
+      i += 1
+
+  result.append(text[start-len(opening):] if depth else text[last:])
+  return "".join(result)
+
+def _link_text(inner):
+  target, _, label = inner.partition('|')
+  if not target.startswith(':') and HIDDEN_LINK.match(target):
+    return ""
+  return label or target.lstrip(':')
+
+def _plain_text(wikitext):
+  """Strip the markup from a piece of wikitext, keeping the readable text."""
+  text = COMMENT.sub('', wikitext)
+  text = REFERENCE.sub('', text)
+  text = _replace_nested(text, '{{', '}}', lambda inner: "")
+  text = _replace_nested(text, '{|', '|}', lambda inner: "")
+  text = _replace_nested(text, '[[', ']]', _link_text)
+  text = EXTERNAL_LINK.sub(r'\1', text)
+  text = BREAK.sub('\n', text)
+  text = HTML_TAG.sub('', text)
+  text = EMPHASIS.sub('', text)
+  text = MAGIC_WORD.sub('', text)
+  text = LIST_MARKER.sub('', text)
+  return text.replace('&nbsp;', ' ')
+
+def _parse_template(inner):
+  parts = _split_top_level(inner)
+  name = parts[0].strip()
+  params = {}
+  position = 1
+  for part in parts[1:]:
+    key, equals, value = part.partition('=')
+    if equals and '[[' not in key and '{{' not in key:
+      params[key.strip()] = value.strip()
+    else:
+      params[str(position)] = part.strip()
+      position += 1
+  return name, params
+
+def _parse_infoboxes(wikitext):
+  infoboxes = []
+
+  def collect(inner):
+    name, params = _parse_template(inner)
+    if 'infobox' in name.lower():
+      data = {}
+      for key, value in params.items():
+        file_link = FILE_LINK.search(value)
+        data[key] = file_link.group(1).strip() if file_link else _plain_text(value).strip()
+      infoboxes.append({
+        'title': data.get('name') or data.get('title') or None,
+        'images': [value for key, value in data.items() if key.startswith('image') and value],
+        'data': data,
+        'groups': []
+      })
+    return ""
+
+  _replace_nested(COMMENT.sub('', wikitext), '{{', '}}', collect)
+  return infoboxes
+
+def parse_wikitext(wikitext, title):
+  """
+  Parse the wikitext of a page into the section structure returned by
+  :class:`FandomPage.content` and the infobox structure returned by
+  :class:`FandomPage.infobox`.
+
+  Infoboxes are read from templates with "infobox" in their name, with the
+  template parameters as the infobox data.
+
+  :param wikitext: The wikitext of the page
+  :param title: The title of the page
+  :type wikitext: str
+  :type title: str
+
+  :returns: :class:`tuple` of the content :class:`dict` and the infobox :class:`list`
+  """
+  infobox = _parse_infoboxes(wikitext)
+
+  content = {'title': title}
+  # Stack of (heading level, section dict), starting with the page itself
+  level_tree = [(1, content)]
+  section_lines = []
+
+  for line in COMMENT.sub('', wikitext).split('\n'):
+    heading = HEADING.match(line)
+    if heading is None:
+      section_lines.append(line)
+      continue
+
+    level_tree[-1][1]['content'] = _plain_text("\n".join(section_lines))
+    section_lines = []
+
+    header_level = len(heading.group(1))
+    while len(level_tree) > 1 and level_tree[-1][0] >= header_level:
+      level_tree.pop()
+
+    section = {'title': _plain_text(heading.group(2)).strip()}
+    level_tree[-1][1].setdefault('sections', []).append(section)
+    level_tree.append((header_level, section))
+
+  level_tree[-1][1]['content'] = _plain_text("\n".join(section_lines))
+
+  if infobox:
+    content['infobox'] = "\n".join(
+      "{}\n{}".format(key, value) for box in infobox for key, value in box['data'].items()
+    )
+
+  return _clean_content(content), infobox
+
+class WikitextPage(FandomPage):
+  """
+  A FandomPage whose content is parsed from wikitext that was already
+  fetched, instead of from the rendered HTML. Creating one makes no
+  requests, and its content, sections, infobox, summary and plain text are
+  all available offline.
+
+  .. warning::
+    Do not manually init fandom.WikitextPage. They are returned by :class:`fandom.wikitext_pages()` and :class:`fandom.read_dump()`.
+
+  :ivar title: The title of the page
+  :ivar pageid: The page id of the page
+  :ivar language: The language of the page
+  :ivar wiki: The wiki the page is on
+  :ivar url: The url to the page
+  """
+
+  def __init__(self, wiki, language, title, pageid, revision_id, wikitext):
+    self.wiki = wiki
+    self.language = language
+    self.title = title
+    self.pageid = pageid
+    self._revision_id = revision_id
+    self._wikitext = wikitext
+    self._lock = threading.RLock()
+    self.url = STANDARD_URL.format(lang=language, wiki=wiki,
+                                   page=title.replace(" ","_").replace("?","%3F"))
+
+  def __repr__(self):
+    return super().__repr__().replace('<FandomPage', '<WikitextPage', 1)
+
+  def section(self, section_title: str):
+    # The wikitext is already here, so parse it instead of letting
+    # FandomPage.section download the section on its own
+    self.content
+    return super().section(section_title)
+
+  @property
+  def content(self):
+    """
+    Text content of each section of the page, parsed from the wikitext, in the
+    same format as :class:`FandomPage.content`.
+
+    :returns: :class:`dict`
+    """
+    if not getattr(self, '_content', False):
+      with self._lock:
+        if not getattr(self, '_content', False):
+          self._set_content(*parse_wikitext(self.wikitext, self.title))
+    return self._content
+
+  @property
+  def infobox(self):
+    """
+    Infoboxes of the page, parsed from the parameters of the infobox templates
+    in the wikitext.
+
+    :returns: :class:`list` of :class:`dict`
+    """
+    if not hasattr(self, '_infobox'):
+      with self._lock:
+        if not hasattr(self, '_infobox'):
+          self._set_content(*parse_wikitext(self.wikitext, self.title))
+    return self._infobox
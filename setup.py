@@ -32,6 +32,10 @@ setuptools.setup(
   keywords = "python wikia fandom API",
   url = "https://github.com/NikolajDanger/fandom-py",
   install_requires = install_reqs,
+  extras_require = {
+    'parquet': ['pyarrow'],
+    'fast': ['orjson']
+  },
   packages = ['fandom'],
   classifiers = [
     'License :: OSI Approved :: MIT License',